@@ -7,4 +7,7 @@ pip install -r requirements.txt
 echo "Setting up Python path..."
 export PYTHONPATH="${PYTHONPATH}:${PWD}/src"
 
+echo "Precompiling Python bytecode..."
+python -m compileall -q src
+
 echo "Build completed successfully!" 
\ No newline at end of file
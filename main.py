@@ -41,12 +41,10 @@ def main():
         
         # Build or load index
         index_path = "vehicle_index"
-        if Path(f"{index_path}.faiss").exists():
-            logger.info("Loading existing index...")
-            retriever.load_index(index_path)
+        if retriever.load_or_build_index(inventory_file, index_path):
+            logger.info("Built new index")
         else:
-            logger.info("Building new index...")
-            retriever.build_index(inventory_file, index_path)
+            logger.info("Loaded existing index")
         
         # Get index statistics
         stats = retriever.get_index_stats()
@@ -65,21 +63,22 @@ def main():
         logger.info("🔍 DEMO QUERIES")
         logger.info("="*60)
         
-        for i, query in enumerate(demo_queries, 1):
+        # One embedding call and one index search for all demo queries
+        try:
+            all_results = retriever.search_vehicles_batch(demo_queries, top_k=3)
+        except Exception as e:
+            logger.error(f"Error processing queries: {e}")
+            all_results = [[] for _ in demo_queries]
+        
+        for i, (query, results) in enumerate(zip(demo_queries, all_results), 1):
             logger.info(f"\nQuery {i}: {query}")
             logger.info("-" * 40)
             
-            try:
-                results = retriever.search_vehicles(query, top_k=3)
-                
-                if results:
-                    formatted_results = retriever.format_search_results(results)
-                    logger.info(formatted_results)
-                else:
-                    logger.info("No vehicles found matching the criteria.")
-                    
-            except Exception as e:
-                logger.error(f"Error processing query: {e}")
+            if results:
+                formatted_results = retriever.format_search_results(results)
+                logger.info(formatted_results)
+            else:
+                logger.info("No vehicles found matching the criteria.")
         
         logger.info("\n" + "="*60)
         logger.info("✅ Demo completed successfully!")
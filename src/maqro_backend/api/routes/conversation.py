@@ -35,6 +35,7 @@ default_agent_config = AgentConfig(
     dealership_name="our dealership",
     persona_blurb="friendly, persuasive car salesperson"
 )
+prompt_builder = PromptBuilder(default_agent_config)
 
 
 @router.post("/messages")
@@ -227,9 +228,7 @@ async def generate_rag_response(
     
     # 5. Build prompt and generate response
     try:
-        prompt_builder = PromptBuilder(default_agent_config)
-        
-        if retrieved_cars and len(retrieved_cars) > 0:
+        if retrieved_cars:
             # Use grounded prompt with retrieved vehicles
             prompt = prompt_builder.build_grounded_prompt(
                 user_message=customer_message,
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
 import logging
 from datetime import datetime
+import orjson
 import pytz
 
 from maqro_rag import EnhancedRAGService
@@ -100,9 +101,10 @@ async def whatsapp_webhook(
             logger.warning("Invalid webhook signature")
             raise HTTPException(status_code=403, detail="Invalid signature")
         
-        # Parse JSON payload
-        webhook_data = await request.json()
-        logger.info(f"Received WhatsApp webhook: {webhook_data}")
+        # Parse JSON payload from the body we already read
+        webhook_data = orjson.loads(body)
+        # Log a bounded preview of the raw body rather than formatting the whole payload
+        logger.info("Received WhatsApp webhook: %s", body[:500].decode(errors="replace"))
         
         # Parse message from webhook
         parsed_message = whatsapp_service.parse_webhook_message(webhook_data)
@@ -4,10 +4,13 @@ from fastapi import FastAPI
 from loguru import logger
 from maqro_rag import Config, VehicleRetriever, EnhancedRAGService
 from maqro_rag.db_retriever import DatabaseRAGRetriever
+from maqro_rag.vector_store import prefetch_index_files
 from maqro_backend.core.config import settings
 from maqro_backend.services.ai_services import analyze_conversation_context
 from maqro_backend.db.session import get_db
 from maqro_backend.crud import ensure_embeddings_for_dealership, get_rag_stats
+from maqro_backend.services.whatsapp_service import whatsapp_service
+from maqro_backend.services.sms_service import sms_service
 # from maqro_backend.db.session import create_tables  # Removed - tables managed by Supabase
 
 
@@ -27,6 +30,10 @@ async def lifespan(app: FastAPI):
     global retriever, db_retriever, enhanced_rag_service
     logger.info("Starting up Maqro API with Database RAG...")
     
+    # Warm the page cache for the legacy index while the retrievers initialize
+    index_path = settings.rag_index_name
+    prefetch_thread = prefetch_index_files(index_path)
+    
     # 1. Load RAG configuration
     config = Config.from_yaml(settings.rag_config_path)
     
@@ -38,7 +45,7 @@ async def lifespan(app: FastAPI):
     retriever = VehicleRetriever(config) 
     
     # Try to load legacy index if it exists (fallback)
-    index_path = settings.rag_index_name
+    prefetch_thread.join()
     if os.path.exists(f"{index_path}.faiss") and os.path.exists(f"{index_path}.metadata"):
         try:
             retriever.load_index(index_path)
@@ -83,6 +90,8 @@ async def lifespan(app: FastAPI):
     yield
     
     logger.info("Shutting down...")
+    await whatsapp_service.aclose()
+    await sms_service.aclose()
 
 
 def get_retriever() -> VehicleRetriever:
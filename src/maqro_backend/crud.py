@@ -9,6 +9,7 @@ from typing import List, Optional
 from datetime import datetime
 import pytz
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -427,14 +428,7 @@ async def get_lead_stats(*, session: AsyncSession, dealership_id: str) -> dict:
     try:
         dealership_uuid = uuid.UUID(dealership_id)
         
-        # Get total leads
-        total_leads_result = await session.execute(
-            select(func.count(Lead.id))
-            .where(Lead.dealership_id == dealership_uuid)
-        )
-        total = total_leads_result.scalar_one()
-
-        # Get leads by status
+        # Get leads by status; the total is their sum, so one round trip covers both
         by_status_result = await session.execute(
             select(Lead.status, func.count(Lead.id))
             .where(Lead.dealership_id == dealership_uuid)
@@ -442,7 +436,7 @@ async def get_lead_stats(*, session: AsyncSession, dealership_id: str) -> dict:
         )
         by_status = {status: count for status, count in by_status_result}
 
-        return {"total": total, "by_status": by_status}
+        return {"total": sum(by_status.values()), "by_status": by_status}
     except (ValueError, TypeError):
         return {"total": 0, "by_status": {}}
 
@@ -804,6 +798,24 @@ def parse_approval_command(message: str) -> str:
 # VEHICLE EMBEDDINGS CRUD OPERATIONS (for RAG system)
 # =============================================================================
 
+_rag_retriever = None
+_rag_retriever_lock = threading.Lock()
+
+
+def _get_rag_retriever():
+    """Return the shared RAG retriever, creating it on first use."""
+    global _rag_retriever
+    if _rag_retriever is None:
+        with _rag_retriever_lock:
+            if _rag_retriever is None:
+                from maqro_rag.db_retriever import DatabaseRAGRetriever
+                from maqro_rag.config import Config
+                
+                config = Config.from_yaml("config.yaml")  # Adjust path as needed
+                _rag_retriever = DatabaseRAGRetriever(config)
+    return _rag_retriever
+
+
 async def ensure_embeddings_for_dealership(
     *, 
     session: AsyncSession, 
@@ -811,12 +823,7 @@ async def ensure_embeddings_for_dealership(
 ) -> dict:
     """Ensure all inventory items have embeddings for RAG search."""
     try:
-        from maqro_rag.db_retriever import DatabaseRAGRetriever
-        from maqro_rag.config import Config
-        
-        # Initialize RAG retriever
-        config = Config.from_yaml("config.yaml")  # Adjust path as needed
-        retriever = DatabaseRAGRetriever(config)
+        retriever = _get_rag_retriever()
         
         # Build missing embeddings
         built_count = await retriever.build_embeddings_for_dealership(
@@ -855,12 +862,7 @@ async def refresh_embeddings_for_dealership(
 ) -> dict:
     """Force refresh all embeddings for a dealership."""
     try:
-        from maqro_rag.db_retriever import DatabaseRAGRetriever
-        from maqro_rag.config import Config
-        
-        # Initialize RAG retriever  
-        config = Config.from_yaml("config.yaml")
-        retriever = DatabaseRAGRetriever(config)
+        retriever = _get_rag_retriever()
         
         # Force rebuild all embeddings
         built_count = await retriever.build_embeddings_for_dealership(
@@ -897,12 +899,7 @@ async def get_rag_stats(
 ) -> dict:
     """Get RAG system statistics for a dealership."""
     try:
-        from maqro_rag.db_retriever import DatabaseRAGRetriever
-        from maqro_rag.config import Config
-        
-        # Initialize RAG retriever
-        config = Config.from_yaml("config.yaml")
-        retriever = DatabaseRAGRetriever(config)
+        retriever = _get_rag_retriever()
         
         # Get stats
         stats = await retriever.get_retriever_stats(session, dealership_id)
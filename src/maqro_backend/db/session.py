@@ -3,6 +3,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.engine import URL
 import os
 import ssl
+import uuid
 
 # Supabase Direct Connection Configuration (Following Official Guidance)
 DB_USER = os.getenv("SUPABASE_USER")
@@ -29,6 +30,28 @@ if not DATABASE_URL and all([DB_USER, DB_PASSWORD, DB_HOST]):
 if not DATABASE_URL:
     raise ValueError("Database connection URL is not set. Please set DATABASE_URL or individual SUPABASE_* variables.")
 
+# Opt in when DATABASE_URL points at Supabase's PgBouncer pooler (transaction mode)
+USE_TRANSACTION_POOLER = os.getenv("SUPABASE_TRANSACTION_POOLER", "").lower() in ("1", "true", "yes")
+
+connect_args = {
+    # RE-ENABLE prepared statement cache (safe with direct connection)
+    "statement_cache_size": 1000,
+    "command_timeout": 30,
+    "server_settings": {
+        "application_name": "maqro_backend_direct",
+    }
+}
+if USE_TRANSACTION_POOLER:
+    # The pooler may hand each transaction a different server connection, so
+    # prepared statements cannot be cached across them, and their names must
+    # be unique so they never collide with another client's on that connection
+    connect_args.update(
+        statement_cache_size=0,
+        prepared_statement_cache_size=0,
+        prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+        server_settings={"application_name": "maqro_backend_pooler"},
+    )
+
 # Optimized engine configuration for direct Supabase connection
 engine = create_async_engine(
     DATABASE_URL,
@@ -40,14 +63,7 @@ engine = create_async_engine(
     execution_options={
         "compiled_cache": {},
     },
-    connect_args={
-        # RE-ENABLE prepared statement cache (safe with direct connection)
-        "statement_cache_size": 1000,
-        "command_timeout": 30,
-        "server_settings": {
-            "application_name": "maqro_backend_direct",
-        }
-    },
+    connect_args=connect_args,
 )
 SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
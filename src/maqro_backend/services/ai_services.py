@@ -11,9 +11,68 @@ from typing import Dict, Any, Tuple, Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import asyncio
+import functools
 import re
 
 
+# Budget range patterns like "$20,000-$30,000" or "20k to 30k", compiled once at import
+_BUDGET_PATTERNS = (
+    re.compile(r'\$?(\d{1,3}(?:,\d{3})*)\s*-\s*\$?(\d{1,3}(?:,\d{3})*)'),
+    re.compile(r'(\d{1,2})k\s*to\s*(\d{1,2})k'),
+    re.compile(r'(\d{1,2})k\s*-\s*(\d{1,2})k'),
+)
+
+# Intent keywords - order matters for priority
+_INTENT_PATTERNS = (
+    ('test_drive', ('test drive', 'drive', 'test', 'schedule')),
+    ('financing', ('finance', 'loan', 'credit', 'payment plan', 'financing')),
+    ('pricing', ('price', 'cost', 'budget', 'afford', 'payment')),
+    ('availability', ('available', 'in stock', 'have', 'stock')),
+    ('features', ('feature', 'spec', 'specification', 'option')),
+    ('trade_in', ('trade', 'trade-in', 'exchange', 'old car')),
+    ('general_inquiry', ('help', 'looking', 'interested', 'information')),
+)
+
+_URGENCY_KEYWORDS = (
+    ('high', ('urgent', 'asap', 'quickly', 'immediately', 'today')),
+    ('medium', ('soon', 'this week', 'next week', 'interested')),
+    ('low', ('someday', 'future', 'maybe', 'thinking')),
+)
+
+# Common preference keywords, checked in order, and whether each category
+# ignores case (color, transmission, fuel type and features match exactly)
+_PREFERENCE_PATTERNS = (
+    ('color', ('color', 'colour', 'red', 'blue', 'black', 'white', 'silver', 'gray'), False),
+    ('transmission', ('automatic', 'manual', 'transmission'), False),
+    ('fuel_type', ('gas', 'diesel', 'electric', 'hybrid', 'fuel'), False),
+    ('body_style', ('sedan', 'suv', 'truck', 'hatchback', 'coupe', 'convertible'), True),
+    ('features', ('leather', 'sunroof', 'navigation', 'backup camera', 'bluetooth'), False),
+    ('make', ('toyota', 'honda', 'ford', 'chevrolet', 'bmw', 'mercedes', 'audi', 'lexus'), True),
+    ('model', ('camry', 'accord', 'civic', 'corolla', 'cr-v', 'rav4', 'f-150', 'silverado'), True),
+)
+
+_VEHICLE_TYPE_KEYWORDS = (
+    ('sedan', ('sedan', 'car', 'passenger')),
+    ('suv', ('suv', 'crossover', 'sport utility')),
+    ('truck', ('truck', 'pickup', 'pick-up')),
+    ('hatchback', ('hatchback', 'hatch')),
+    ('coupe', ('coupe', 'sports car')),
+    ('convertible', ('convertible',)),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_prompt_builder():
+    """Build the default agent config and prompt builder once"""
+    from maqro_rag.prompt_builder import PromptBuilder, AgentConfig
+    
+    agent_config = AgentConfig(
+        tone="friendly",
+        dealership_name="our dealership",
+        persona_blurb="friendly, persuasive car salesperson"
+    )
+    return agent_config, PromptBuilder(agent_config)
+
 
 async def get_all_conversation_history(lead_id: int, db: AsyncSession) -> List[Dict]:
     """
@@ -100,18 +159,7 @@ def _detect_intent(messages: List[str]) -> str:
     
     last_message = messages[-1]
     
-    # Intent keywords - order matters for priority
-    intent_patterns = [
-        ('test_drive', ['test drive', 'drive', 'test', 'schedule']),
-        ('financing', ['finance', 'loan', 'credit', 'payment plan', 'financing']),
-        ('pricing', ['price', 'cost', 'budget', 'afford', 'payment']),
-        ('availability', ['available', 'in stock', 'have', 'stock']),
-        ('features', ['feature', 'spec', 'specification', 'option']),
-        ('trade_in', ['trade', 'trade-in', 'exchange', 'old car']),
-        ('general_inquiry', ['help', 'looking', 'interested', 'information'])
-    ]
-    
-    for intent, keywords in intent_patterns:
+    for intent, keywords in _INTENT_PATTERNS:
         if any(keyword in last_message for keyword in keywords):
             return intent
     
@@ -122,66 +170,27 @@ def _extract_preferences(messages: List[str]) -> Dict[str, Any]:
     """Extract customer preferences from messages"""
     preferences = {}
     
-    # Common preference patterns
-    preference_patterns = {
-        'color': ['color', 'colour', 'red', 'blue', 'black', 'white', 'silver', 'gray'],
-        'transmission': ['automatic', 'manual', 'transmission'],
-        'fuel_type': ['gas', 'diesel', 'electric', 'hybrid', 'fuel'],
-        'body_style': ['sedan', 'suv', 'truck', 'hatchback', 'coupe', 'convertible'],
-        'features': ['leather', 'sunroof', 'navigation', 'backup camera', 'bluetooth']
-    }
+    # Scan all messages at once; keywords never contain newlines, so joining
+    # cannot create matches that span two messages
+    blob = "\n".join(messages)
+    blob_lower = blob.lower()
     
-    # Check for body style in messages
-    for message in messages:
-        message_lower = message.lower()
-        for body_style in ['sedan', 'suv', 'truck', 'hatchback', 'coupe', 'convertible']:
-            if body_style in message_lower:
-                if 'body_style' not in preferences:
-                    preferences['body_style'] = []
-                preferences['body_style'].append(body_style)
-    
-    for category, keywords in preference_patterns.items():
-        found_preferences = []
-        for message in messages:
-            for keyword in keywords:
-                if keyword in message:
-                    found_preferences.append(keyword)
+    for category, keywords, ignore_case in _PREFERENCE_PATTERNS:
+        text = blob_lower if ignore_case else blob
+        found_preferences = [keyword for keyword in keywords if keyword in text]
         if found_preferences:
-            preferences[category] = list(set(found_preferences))
-    
-    # Add make/model preferences if found
-    for message in messages:
-        # Common car makes
-        makes = ['toyota', 'honda', 'ford', 'chevrolet', 'bmw', 'mercedes', 'audi', 'lexus']
-        for make in makes:
-            if make in message.lower():
-                if 'make' not in preferences:
-                    preferences['make'] = []
-                preferences['make'].append(make)
-        
-        # Common car models
-        models = ['camry', 'accord', 'civic', 'corolla', 'cr-v', 'rav4', 'f-150', 'silverado']
-        for model in models:
-            if model in message.lower():
-                if 'model' not in preferences:
-                    preferences['model'] = []
-                preferences['model'].append(model)
+            preferences[category] = found_preferences
     
     return preferences
 
 
 def _detect_urgency(messages: List[str]) -> str:
     """Detect urgency level from messages"""
-    urgency_keywords = {
-        'high': ['urgent', 'asap', 'quickly', 'immediately', 'today'],
-        'medium': ['soon', 'this week', 'next week', 'interested'],
-        'low': ['someday', 'future', 'maybe', 'thinking']
-    }
+    blob = "\n".join(messages)
     
-    for urgency, keywords in urgency_keywords.items():
-        for message in messages:
-            if any(keyword in message for keyword in keywords):
-                return urgency
+    for urgency, keywords in _URGENCY_KEYWORDS:
+        if any(keyword in blob for keyword in keywords):
+            return urgency
     
     return 'medium'  # Default
 
@@ -189,15 +198,8 @@ def _detect_urgency(messages: List[str]) -> str:
 def _extract_budget_range(messages: List[str]) -> Optional[Tuple[float, float]]:
     """Extract budget range from messages"""
     for message in messages:
-        # Look for price patterns like "$20,000-$30,000" or "20k to 30k"
-        price_patterns = [
-            r'\$?(\d{1,3}(?:,\d{3})*)\s*-\s*\$?(\d{1,3}(?:,\d{3})*)',
-            r'(\d{1,2})k\s*to\s*(\d{1,2})k',
-            r'(\d{1,2})k\s*-\s*(\d{1,2})k'
-        ]
-        
-        for pattern in price_patterns:
-            matches = re.findall(pattern, message)
+        for pattern in _BUDGET_PATTERNS:
+            matches = pattern.findall(message)
             if matches:
                 try:
                     min_price = float(matches[0][0].replace(',', ''))
@@ -211,19 +213,11 @@ def _extract_budget_range(messages: List[str]) -> Optional[Tuple[float, float]]:
 
 def _detect_vehicle_type(messages: List[str]) -> Optional[str]:
     """Detect preferred vehicle type from messages"""
-    vehicle_types = {
-        'sedan': ['sedan', 'car', 'passenger'],
-        'suv': ['suv', 'crossover', 'sport utility'],
-        'truck': ['truck', 'pickup', 'pick-up'],
-        'hatchback': ['hatchback', 'hatch'],
-        'coupe': ['coupe', 'sports car'],
-        'convertible': ['convertible', 'convertible']
-    }
+    blob = "\n".join(messages)
     
-    for vehicle_type, keywords in vehicle_types.items():
-        for message in messages:
-            if any(keyword in message for keyword in keywords):
-                return vehicle_type
+    for vehicle_type, keywords in _VEHICLE_TYPE_KEYWORDS:
+        if any(keyword in blob for keyword in keywords):
+            return vehicle_type
     
     return None
 
@@ -350,18 +344,9 @@ async def generate_contextual_ai_response(
     
     # Use new conversational prompt builder if available
     try:
-        from maqro_rag.prompt_builder import PromptBuilder, AgentConfig
-        
-        # Create agent config from context
-        agent_config = AgentConfig(
-            tone="friendly",
-            dealership_name="our dealership",
-            persona_blurb="friendly, persuasive car salesperson"
-        )
-        
-        prompt_builder = PromptBuilder(agent_config)
+        agent_config, prompt_builder = _get_prompt_builder()
         
-        if vehicles and len(vehicles) > 0:
+        if vehicles:
             # Use grounded prompt with retrieved vehicles
             prompt = prompt_builder.build_grounded_prompt(
                 user_message=last_message,
@@ -403,7 +388,7 @@ async def generate_contextual_ai_response(
         except Exception as e:
             logger.error(f"Error calling OpenAI: {e}")
             # Fallback to simple response
-            if vehicles and len(vehicles) > 0:
+            if vehicles:
                 vehicle = vehicles[0]['vehicle']
                 year = vehicle.get('year', '')
                 make = vehicle.get('make', '')
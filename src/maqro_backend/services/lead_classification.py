@@ -36,10 +36,15 @@ MANUAL_STATUSES = {"appointment_booked", "deal_won", "deal_lost"}
 
 
 
-async def classify_lead(session: AsyncSession, lead: Lead) -> bool:
+async def classify_lead(session: AsyncSession, lead: Lead, now: datetime = None) -> bool:
     """
     Classify a single lead based on conversation patterns and timing.
     
+    Args:
+        session: Database session
+        lead: Lead to classify
+        now: Reference time in UTC; defaults to the current time
+    
     Returns:
         bool: True if status was updated, False otherwise
     """
@@ -48,7 +53,8 @@ async def classify_lead(session: AsyncSession, lead: Lead) -> bool:
         return False
     
     # Get current time in UTC
-    now = datetime.now(pytz.UTC)
+    if now is None:
+        now = datetime.now(pytz.UTC)
     
     # Get all conversations for this lead
     conversations = await get_conversations_by_lead_id(session=session, lead_id=str(lead.id))
@@ -184,6 +190,8 @@ async def classify_all_leads(session: AsyncSession, dealership_id: str = None, b
     Returns:
         dict: Summary of classification results
     """
+    # One reference time for the whole run so every lead is judged against the same clock
+    now = datetime.now(pytz.UTC)
     offset = 0
     total_processed = 0
     total_updated = 0
@@ -210,7 +218,7 @@ async def classify_all_leads(session: AsyncSession, dealership_id: str = None, b
             if lead.status in MANUAL_STATUSES:
                 continue
                 
-            was_updated = await classify_lead(session, lead)
+            was_updated = await classify_lead(session, lead, now)
             if was_updated:
                 batch_updated += 1
                 
@@ -229,5 +237,5 @@ async def classify_all_leads(session: AsyncSession, dealership_id: str = None, b
         "total_processed": total_processed,
         "total_updated": total_updated,
         "status_distribution": status_counts,
-        "timestamp": datetime.now(pytz.UTC).isoformat()
+        "timestamp": now.isoformat()
     } 
\ No newline at end of file
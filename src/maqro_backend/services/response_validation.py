@@ -11,6 +11,23 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Content and call-to-action patterns, compiled once and shared by all validators
+_INAPPROPRIATE_CONTENT_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\b(offensive|inappropriate|unprofessional)\b',
+    r'\b(price\s+too\s+high|expensive|overpriced)\b',
+    r'\b(not\s+interested|don\'t\s+want|hate)\b'
+))
+
+_CTA_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'schedule.*test drive',
+    r'contact.*us',
+    r'call.*us',
+    r'visit.*us',
+    r'would you like',
+    r'can I help',
+    r'let me know'
+))
+
 
 class ResponseValidator:
     """Validates and ensures quality of AI responses"""
@@ -25,11 +42,7 @@ class ResponseValidator:
             'min_completeness_score': 0.4
         }
         
-        self.inappropriate_content_patterns = [
-            r'\b(offensive|inappropriate|unprofessional)\b',
-            r'\b(price\s+too\s+high|expensive|overpriced)\b',
-            r'\b(not\s+interested|don\'t\s+want|hate)\b'
-        ]
+        self.inappropriate_content_patterns = _INAPPROPRIATE_CONTENT_PATTERNS
         
         self.fallback_responses = {
             'no_vehicles': "I'd be happy to help you find the perfect vehicle! Could you tell me more about what you're looking for?",
@@ -122,7 +135,7 @@ class ResponseValidator:
         text_lower = text.lower()
         
         for pattern in self.inappropriate_content_patterns:
-            if re.search(pattern, text_lower):
+            if pattern.search(text_lower):
                 return True
         
         return False
@@ -185,18 +198,8 @@ class ResponseValidator:
     
     def _has_call_to_action(self, text: str) -> bool:
         """Check if response has a call-to-action"""
-        cta_patterns = [
-            r'schedule.*test drive',
-            r'contact.*us',
-            r'call.*us',
-            r'visit.*us',
-            r'would you like',
-            r'can I help',
-            r'let me know'
-        ]
-        
         text_lower = text.lower()
-        return any(re.search(pattern, text_lower) for pattern in cta_patterns)
+        return any(pattern.search(text_lower) for pattern in _CTA_PATTERNS)
     
     def get_response_insights(self, response_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -2,6 +2,9 @@
 Salesperson SMS Service for handling lead creation and inventory updates via SMS
 """
 import logging
+import re
+import urllib.parse
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,6 +22,45 @@ from .sms_parser import sms_parser
 
 logger = logging.getLogger(__name__)
 
+# Relative day offsets and month abbreviations accepted for test drive dates
+_RELATIVE_DAYS = {"today": 0, "tomorrow": 1, "next week": 7}
+_MONTHS = {
+    name: number for number, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1
+    )
+}
+
+# One pass over the date string: relative day, MM/DD[/YYYY] or "Dec 15"
+_DATE_RE = re.compile(
+    r"^(?:(?P<rel>today|tomorrow|next week)"
+    r"|(?P<m>\d{1,2})/(?P<d>\d{1,2})(?:/(?P<y>\d{1,4}))?"
+    r"|(?P<mon>" + "|".join(_MONTHS) + r")\s+(?P<dd>\d{1,2}))$",
+    re.IGNORECASE,
+)
+
+# Times like "2pm", "2:30 pm" or 24-hour "14:00"
+_TIME_RE = re.compile(
+    r"^\s*(?P<hour>\d{1,2})(?::(?P<minute>\d{1,2}))?\s*(?P<meridiem>am|pm)?\s*$",
+    re.IGNORECASE,
+)
+
+
+def _calendar_timestamp(value: datetime) -> str:
+    """Format a datetime as Google Calendar's YYYYMMDDTHHMMSS without strftime"""
+    return (
+        f"{value.year:04d}{value.month:02d}{value.day:02d}"
+        f"T{value.hour:02d}{value.minute:02d}{value.second:02d}"
+    )
+
+
+# Static Google Calendar template parameters, encoded once
+_CALENDAR_BASE_URL = "https://calendar.google.com/calendar/render?" + urllib.parse.urlencode({
+    "action": "TEMPLATE",
+    "location": "Dealership",  # Could be made configurable
+    "sf": "true",  # Show form
+    "output": "xml"
+})
+
 
 class SalespersonSMSService:
     """Service for handling salesperson SMS operations"""
@@ -546,59 +588,36 @@ class SalespersonSMSService:
     ) -> str:
         """Generate Google Calendar URL for test drive appointment"""
         try:
-            from datetime import datetime, timedelta
-            import urllib.parse
-            
             # Parse the preferred date and time
             # Handle common date formats
-            if preferred_date.lower() == "tomorrow":
-                appointment_date = datetime.now() + timedelta(days=1)
-            elif preferred_date.lower() == "today":
-                appointment_date = datetime.now()
-            elif preferred_date.lower() == "next week":
-                appointment_date = datetime.now() + timedelta(days=7)
-            else:
-                # Try to parse specific dates like "Dec 15" or "12/15"
+            now = datetime.now()
+            appointment_date = now + timedelta(days=1)  # Default to tomorrow if parsing fails
+            match = _DATE_RE.match(preferred_date.strip())
+            if match:
+                groups = match.groupdict()
                 try:
-                    if "/" in preferred_date:
+                    if groups["rel"]:
+                        appointment_date = now + timedelta(days=_RELATIVE_DAYS[groups["rel"].lower()])
+                    elif groups["m"]:
                         # Format: MM/DD or MM/DD/YYYY
-                        parts = preferred_date.split("/")
-                        if len(parts) == 2:
-                            month, day = int(parts[0]), int(parts[1])
-                            year = datetime.now().year
-                            appointment_date = datetime(year, month, day)
-                        else:
-                            month, day, year = int(parts[0]), int(parts[1]), int(parts[2])
-                            appointment_date = datetime(year, month, day)
+                        year = int(groups["y"]) if groups["y"] else now.year
+                        appointment_date = datetime(year, int(groups["m"]), int(groups["d"]))
                     else:
-                        # Try to parse with current year
-                        appointment_date = datetime.strptime(f"{preferred_date} {datetime.now().year}", "%b %d %Y")
-                except:
-                    # Default to tomorrow if parsing fails
-                    appointment_date = datetime.now() + timedelta(days=1)
+                        # Format: "Dec 15" in the current year
+                        appointment_date = datetime(now.year, _MONTHS[groups["mon"].lower()], int(groups["dd"]))
+                except ValueError:
+                    pass
             
             # Parse time (handle formats like "2pm", "2:30pm", "14:00")
-            time_str = preferred_time.lower().replace(" ", "")
-            if "pm" in time_str:
-                time_str = time_str.replace("pm", "")
-                if ":" in time_str:
-                    hour, minute = map(int, time_str.split(":"))
-                    hour = hour + 12 if hour != 12 else 12
-                else:
-                    hour, minute = int(time_str) + 12, 0
-            elif "am" in time_str:
-                time_str = time_str.replace("am", "")
-                if ":" in time_str:
-                    hour, minute = map(int, time_str.split(":"))
-                    hour = 0 if hour == 12 else hour
-                else:
-                    hour, minute = int(time_str), 0
-            else:
-                # Assume 24-hour format
-                if ":" in time_str:
-                    hour, minute = map(int, time_str.split(":"))
-                else:
-                    hour, minute = int(time_str), 0
+            time_match = _TIME_RE.match(preferred_time)
+            if not time_match:
+                raise ValueError(f"Unrecognized time: {preferred_time!r}")
+            hour = int(time_match["hour"])
+            minute = int(time_match["minute"] or 0)
+            meridiem = (time_match["meridiem"] or "").lower()
+            if meridiem:
+                # 12am is midnight and 12pm is noon
+                hour = hour % 12 + (12 if meridiem == "pm" else 0)
             
             # Set the appointment time
             appointment_datetime = appointment_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
@@ -607,33 +626,29 @@ class SalespersonSMSService:
             end_datetime = appointment_datetime + timedelta(hours=1)
             
             # Format dates for Google Calendar
-            start_date = appointment_datetime.strftime("%Y%m%dT%H%M%S")
-            end_date = end_datetime.strftime("%Y%m%dT%H%M%S")
+            start_date = _calendar_timestamp(appointment_datetime)
+            end_date = _calendar_timestamp(end_datetime)
             
             # Create event details
             event_title = f"Test Drive: {customer_name} - {vehicle_interest}"
-            event_description = f"Test drive appointment for {customer_name}\n\n"
-            event_description += f"Vehicle: {vehicle_interest}\n"
-            event_description += f"Salesperson: {salesperson_name}\n"
+            description_lines = [
+                f"Test drive appointment for {customer_name}",
+                "",
+                f"Vehicle: {vehicle_interest}",
+                f"Salesperson: {salesperson_name}",
+            ]
             if special_requests and special_requests != "None":
-                event_description += f"Special Requests: {special_requests}\n"
-            event_description += f"\nScheduled via Maqro SMS system"
+                description_lines.append(f"Special Requests: {special_requests}")
+            description_lines += ["", "Scheduled via Maqro SMS system"]
+            event_description = "\n".join(description_lines)
             
-            # Build Google Calendar URL
-            base_url = "https://calendar.google.com/calendar/render"
-            params = {
-                "action": "TEMPLATE",
+            # Build Google Calendar URL; only the per-event fields need encoding
+            query_string = urllib.parse.urlencode({
                 "text": event_title,
                 "dates": f"{start_date}/{end_date}",
-                "details": event_description,
-                "location": "Dealership",  # Could be made configurable
-                "sf": "true",  # Show form
-                "output": "xml"
-            }
-            
-            # Encode parameters
-            query_string = urllib.parse.urlencode(params)
-            calendar_url = f"{base_url}?{query_string}"
+                "details": event_description
+            })
+            calendar_url = f"{_CALENDAR_BASE_URL}&{query_string}"
             
             return calendar_url
             
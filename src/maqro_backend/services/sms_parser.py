@@ -2,9 +2,12 @@
 SMS Parser Service for extracting structured data from salesperson messages using LLM
 """
 import re
+import asyncio
 import logging
 import json
-from typing import Dict, Any, Optional, Tuple
+import copy
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import os
 
@@ -15,24 +18,38 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Most recent successful parses kept by SMSParser
+_PARSE_CACHE_SIZE = 1024
 
-class SMSParser:
-    """Service for parsing SMS messages and extracting structured data using LLM"""
-    
-    def __init__(self):
-        """Initialize SMS parser with LLM"""
-        if openai is None:
-            raise ImportError("OpenAI package not installed. Run: pip install openai")
-        
-        self.api_key = os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
-            raise ValueError("OPENAI_API_KEY environment variable is required")
-        
-        self.client = openai.OpenAI(api_key=self.api_key)
-        self.model = "gpt-4o-mini"  # Using GPT-4o-mini for cost efficiency
-        
-        # System prompt for the LLM
-        self.system_prompt = """You are an SMS parser for a car dealership. Your job is to extract structured data from salesperson messages and classify the message type.
+# Message type -> (fields needed for high confidence, minimum extracted for medium)
+_CONFIDENCE_RULES = {
+    "lead_creation": (("name", "phone", "car_interest"), 2),
+    "inventory_update": (("year", "make", "model"), 2),
+    "lead_inquiry": (("lead_identifier", "inquiry_type"), 1),
+    "inventory_inquiry": (("inquiry_type",), 0),
+    "general_question": (("question_topic",), 0),
+    "status_update": (("lead_identifier", "update_type"), 1),
+}
+
+# Keywords behind each fallback message type, matched as plain substrings
+_LEAD_CREATION_KEYWORDS = ("met", "lead", "customer", "prospect")
+_INVENTORY_UPDATE_KEYWORDS = ("picked up", "inventory", "vehicle", "car", "add")
+_LEAD_INQUIRY_KEYWORDS = ("status", "check", "details", "lead", "customer")
+_INVENTORY_INQUIRY_KEYWORDS = ("stock", "available", "have", "price")
+_QUESTION_KEYWORDS = ("what", "how", "?")
+_GENERAL_QUESTION_KEYWORDS = ("schedule", "help", "need", "question")
+_STATUS_UPDATE_KEYWORDS = ("update", "progress", "coming", "decided", "test drive")
+_TEST_DRIVE_KEYWORDS = ("test drive", "schedule", "appointment")
+_TEST_DRIVE_INTENT_KEYWORDS = ("customer", "wants", "interested")
+
+# Concurrent LLM requests made by SMSParser.parse_messages
+_MAX_CONCURRENT_PARSES = 8
+
+# Markdown code fence the model sometimes wraps its JSON in
+_JSON_FENCE_RE = re.compile(r"^```(?:json)?(.*?)(?:```|$)", re.DOTALL)
+
+# System prompt for the LLM
+_SYSTEM_PROMPT = """You are an SMS parser for a car dealership. Your job is to extract structured data from salesperson messages and classify the message type.
 
 Extract information for these message types:
 
@@ -137,6 +154,28 @@ For test drive scheduling, the JSON should look like:
   "special_requests": "2-hour window"
 }"""
 
+
+class SMSParser:
+    """Service for parsing SMS messages and extracting structured data using LLM"""
+    
+    def __init__(self):
+        """Initialize SMS parser with LLM"""
+        if openai is None:
+            raise ImportError("OpenAI package not installed. Run: pip install openai")
+        
+        self.api_key = os.getenv("OPENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is required")
+        
+        self.client = openai.OpenAI(api_key=self.api_key)
+        self.model = "gpt-4o-mini"  # Using GPT-4o-mini for cost efficiency
+        
+        # System prompt for the LLM
+        self.system_prompt = _SYSTEM_PROMPT
+        
+        # Successful LLM parses keyed by message text; identical SMS skip the API call
+        self._parse_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
     def parse_message(self, message: str) -> Dict[str, Any]:
         """
         Parse SMS message using LLM to determine if it's a lead creation or inventory update
@@ -152,135 +191,159 @@ For test drive scheduling, the JSON should look like:
         try:
             # Use LLM to parse the message
             parsed_data = self._parse_with_llm(message)
-            
-            if parsed_data and "type" in parsed_data:
-                # Determine confidence based on extracted data quality
-                confidence = self._assess_confidence(parsed_data)
-                
-                return {
-                    "type": parsed_data["type"],
-                    "data": parsed_data,
-                    "confidence": confidence
-                }
-            else:
-                return {
-                    "type": "unknown",
-                    "data": {},
-                    "confidence": "low"
-                }
+            return self._build_result(parsed_data)
                 
         except Exception as e:
             logger.error(f"Error parsing message with LLM: {e}")
             # Fallback to basic pattern matching if LLM fails
             return self._fallback_parse(message)
     
-    def _parse_with_llm(self, message: str) -> Optional[Dict[str, Any]]:
-        """Parse message using OpenAI chat completions"""
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": f"Parse this SMS message: {message}"}
-                ],
-                temperature=0.1,  # Low temperature for consistent parsing
-                max_tokens=500
-            )
+    async def parse_messages(self, messages: List[str]) -> List[Dict[str, Any]]:
+        """
+        Parse several SMS messages concurrently with the async OpenAI client
+        
+        Args:
+            messages: Raw SMS message texts
             
-            content = response.choices[0].message.content.strip()
+        Returns:
+            Parsed results in the same order and shape as parse_message
+        """
+        # Cap in-flight requests to stay within OpenAI rate limits
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_PARSES)
+        
+        # The client's connection pool is bound to the running event loop, so
+        # each call gets its own and closes it when done
+        async with openai.AsyncOpenAI(api_key=self.api_key) as client:
+            async def parse_one(message: str) -> Dict[str, Any]:
+                message = message.strip()
+                try:
+                    async with semaphore:
+                        parsed_data = await self._parse_with_llm_async(client, message)
+                    return self._build_result(parsed_data)
+                except Exception as e:
+                    logger.error(f"Error parsing message with LLM: {e}")
+                    return self._fallback_parse(message)
             
-            # Try to extract JSON from the response
-            try:
-                # Remove any markdown formatting if present
-                if content.startswith("```json"):
-                    content = content.split("```json")[1].split("```")[0]
-                elif content.startswith("```"):
-                    content = content.split("```")[1].split("```")[0]
-                
-                parsed_data = json.loads(content)
-                return parsed_data
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse LLM response as JSON: {e}")
-                logger.error(f"Raw response: {content}")
-                return None
-                
+            return list(await asyncio.gather(*(parse_one(message) for message in messages)))
+    
+    def _build_result(self, parsed_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Wrap LLM output with its message type and confidence"""
+        if parsed_data and "type" in parsed_data:
+            # Determine confidence based on extracted data quality
+            confidence = self._assess_confidence(parsed_data)
+            
+            return {
+                "type": parsed_data["type"],
+                "data": parsed_data,
+                "confidence": confidence
+            }
+        
+        return {
+            "type": "unknown",
+            "data": {},
+            "confidence": "low"
+        }
+    
+    def _parse_with_llm(self, message: str) -> Optional[Dict[str, Any]]:
+        """Parse message using OpenAI chat completions, reusing earlier parses of the same text"""
+        cached = self._get_cached_parse(message)
+        if cached is not None:
+            return cached
+        return self._cache_parse(message, self._request_llm_parse(message))
+    
+    async def _parse_with_llm_async(self, client: "openai.AsyncOpenAI", message: str) -> Optional[Dict[str, Any]]:
+        """Async counterpart of _parse_with_llm"""
+        cached = self._get_cached_parse(message)
+        if cached is not None:
+            return cached
+        return self._cache_parse(message, await self._request_llm_parse_async(client, message))
+    
+    def _get_cached_parse(self, message: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of an earlier successful parse of this message, if any"""
+        cached = self._parse_cache.get(message)
+        if cached is None:
+            return None
+        self._parse_cache.move_to_end(message)
+        return copy.deepcopy(cached)
+    
+    def _cache_parse(self, message: str, parsed_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Remember a successful parse and pass it through"""
+        if parsed_data is not None:
+            self._parse_cache[message] = copy.deepcopy(parsed_data)
+            if len(self._parse_cache) > _PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        return parsed_data
+    
+    def _llm_request(self, message: str) -> Dict[str, Any]:
+        """Chat completion arguments for parsing a message"""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": f"Parse this SMS message: {message}"}
+            ],
+            "temperature": 0.1,  # Low temperature for consistent parsing
+            "max_tokens": 500
+        }
+    
+    def _request_llm_parse(self, message: str) -> Optional[Dict[str, Any]]:
+        """Ask the LLM to parse a message"""
+        try:
+            response = self.client.chat.completions.create(**self._llm_request(message))
+            return self._decode_llm_content(response.choices[0].message.content)
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
             return None
     
-    def _assess_confidence(self, parsed_data: Dict[str, Any]) -> str:
-        """Assess confidence level based on extracted data quality"""
-        if parsed_data["type"] == "lead_creation":
-            required_fields = ["name", "phone", "car_interest"]
-            extracted_fields = sum(1 for field in required_fields if parsed_data.get(field))
-            
-            if extracted_fields == len(required_fields):
-                return "high"
-            elif extracted_fields >= 2:
-                return "medium"
-            else:
-                return "low"
-                
-        elif parsed_data["type"] == "inventory_update":
-            required_fields = ["year", "make", "model"]
-            extracted_fields = sum(1 for field in required_fields if parsed_data.get(field))
-            
-            if extracted_fields == len(required_fields):
-                return "high"
-            elif extracted_fields >= 2:
-                return "medium"
-            else:
-                return "low"
-        
-        elif parsed_data["type"] == "lead_inquiry":
-            required_fields = ["lead_identifier", "inquiry_type"]
-            extracted_fields = sum(1 for field in required_fields if parsed_data.get(field))
-            
-            if extracted_fields == len(required_fields):
-                return "high"
-            elif extracted_fields >= 1:
-                return "medium"
-            else:
-                return "low"
+    async def _request_llm_parse_async(self, client: "openai.AsyncOpenAI", message: str) -> Optional[Dict[str, Any]]:
+        """Ask the LLM to parse a message without blocking the event loop"""
+        try:
+            response = await client.chat.completions.create(**self._llm_request(message))
+            return self._decode_llm_content(response.choices[0].message.content)
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            return None
+    
+    def _decode_llm_content(self, content: str) -> Optional[Dict[str, Any]]:
+        """Extract the JSON object from an LLM reply"""
+        content = content.strip()
         
-        elif parsed_data["type"] == "inventory_inquiry":
-            required_fields = ["inquiry_type"]
-            extracted_fields = sum(1 for field in required_fields if parsed_data.get(field))
+        # Try to extract JSON from the response
+        try:
+            # Remove any markdown formatting if present
+            fence = _JSON_FENCE_RE.match(content)
+            if fence:
+                content = fence.group(1)
             
-            if extracted_fields == len(required_fields):
-                return "high"
-            else:
-                return "medium"
-        
-        elif parsed_data["type"] == "general_question":
-            required_fields = ["question_topic"]
-            extracted_fields = sum(1 for field in required_fields if parsed_data.get(field))
+            return json.loads(content)
             
-            if extracted_fields == len(required_fields):
-                return "high"
-            else:
-                return "medium"
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse LLM response as JSON: {e}")
+            logger.error(f"Raw response: {content}")
+            return None
+    
+    def _assess_confidence(self, parsed_data: Dict[str, Any]) -> str:
+        """Assess confidence level based on extracted data quality"""
+        rule = _CONFIDENCE_RULES.get(parsed_data["type"])
+        if rule is None:
+            return "low"
         
-        elif parsed_data["type"] == "status_update":
-            required_fields = ["lead_identifier", "update_type"]
-            extracted_fields = sum(1 for field in required_fields if parsed_data.get(field))
-            
-            if extracted_fields == len(required_fields):
-                return "high"
-            elif extracted_fields >= 1:
-                return "medium"
-            else:
-                return "low"
+        required_fields, medium_threshold = rule
+        extracted_fields = sum(1 for field in required_fields if parsed_data.get(field))
         
-        return "low"
+        if extracted_fields == len(required_fields):
+            return "high"
+        elif extracted_fields >= medium_threshold:
+            return "medium"
+        else:
+            return "low"
     
     def _fallback_parse(self, message: str) -> Dict[str, Any]:
         """Fallback parsing using basic pattern matching if LLM fails"""
         message_lower = message.lower()
         
         # Simple keyword-based fallback for different message types
-        if any(word in message_lower for word in ["met", "lead", "customer", "prospect"]):
+        if any(word in message_lower for word in _LEAD_CREATION_KEYWORDS):
             return {
                 "type": "lead_creation",
                 "data": {
@@ -293,7 +356,7 @@ For test drive scheduling, the JSON should look like:
                 },
                 "confidence": "low"
             }
-        elif any(word in message_lower for word in ["picked up", "inventory", "vehicle", "car", "add"]):
+        elif any(word in message_lower for word in _INVENTORY_UPDATE_KEYWORDS):
             return {
                 "type": "inventory_update",
                 "data": {
@@ -308,7 +371,7 @@ For test drive scheduling, the JSON should look like:
                 },
                 "confidence": "low"
             }
-        elif any(word in message_lower for word in ["status", "check", "details", "lead", "customer"]) and any(word in message_lower for word in ["what", "how", "?"]):
+        elif any(word in message_lower for word in _LEAD_INQUIRY_KEYWORDS) and any(word in message_lower for word in _QUESTION_KEYWORDS):
             return {
                 "type": "lead_inquiry",
                 "data": {
@@ -318,7 +381,7 @@ For test drive scheduling, the JSON should look like:
                 },
                 "confidence": "low"
             }
-        elif any(word in message_lower for word in ["stock", "available", "have", "price"]) and any(word in message_lower for word in ["what", "how", "?"]):
+        elif any(word in message_lower for word in _INVENTORY_INQUIRY_KEYWORDS) and any(word in message_lower for word in _QUESTION_KEYWORDS):
             return {
                 "type": "inventory_inquiry",
                 "data": {
@@ -332,7 +395,7 @@ For test drive scheduling, the JSON should look like:
                 },
                 "confidence": "low"
             }
-        elif any(word in message_lower for word in ["schedule", "help", "need", "question"]) or "?" in message:
+        elif any(word in message_lower for word in _GENERAL_QUESTION_KEYWORDS) or "?" in message:
             return {
                 "type": "general_question",
                 "data": {
@@ -342,7 +405,7 @@ For test drive scheduling, the JSON should look like:
                 },
                 "confidence": "low"
             }
-        elif any(word in message_lower for word in ["update", "progress", "coming", "decided", "test drive"]):
+        elif any(word in message_lower for word in _STATUS_UPDATE_KEYWORDS):
             return {
                 "type": "status_update",
                 "data": {
@@ -352,7 +415,7 @@ For test drive scheduling, the JSON should look like:
                 },
                 "confidence": "low"
             }
-        elif any(word in message_lower for word in ["test drive", "schedule", "appointment"]) and any(word in message_lower for word in ["customer", "wants", "interested"]):
+        elif any(word in message_lower for word in _TEST_DRIVE_KEYWORDS) and any(word in message_lower for word in _TEST_DRIVE_INTENT_KEYWORDS):
             return {
                 "type": "test_drive_scheduling",
                 "data": {
@@ -2,13 +2,23 @@
 Vonage SMS Service for sending and handling SMS messages
 """
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from ..core.config import settings
 from ..utils.phone_utils import normalize_phone_number
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Keep enough warm connections for bursts of outbound messages
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Parsed once; relative to base_url on the pooled client
+_SEND_SMS_URL = httpx.URL("/sms/json")
+
+# Error bodies are only logged, so cap how much of them we decode and keep
+_MAX_ERROR_BODY_CHARS = 500
+
 
 class VonageSMSService:
     """Service for handling Vonage SMS operations"""
@@ -18,6 +28,19 @@ class VonageSMSService:
         self.api_secret = settings.vonage_api_secret
         self.phone_number = settings.vonage_phone_number
         self.base_url = "https://rest.nexmo.com"
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(base_url=self.base_url, limits=_HTTP_LIMITS)
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     def _validate_credentials(self) -> bool:
         """Validate that all required Vonage credentials are available"""
@@ -48,37 +71,40 @@ class VonageSMSService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/sms/json",
-                    data=data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"}
+            # Reuse pooled connections instead of a new TLS handshake per message
+            client = self._get_client()
+            response = await client.post(
+                _SEND_SMS_URL,
+                data=data
+            )
+            
+            if response.status_code != 200:
+                logger.error(
+                    "Vonage API error: %s - %s",
+                    response.status_code, response.text[:_MAX_ERROR_BODY_CHARS]
                 )
-                
-                if response.status_code != 200:
-                    logger.error(f"Vonage API error: {response.status_code} - {response.text}")
-                    return {"success": False, "error": "Failed to send SMS"}
-                
-                result = response.json()
-                logger.info(f"Vonage response: {result}")
-                
-                # Check if message was sent successfully
-                if result.get("messages") and len(result["messages"]) > 0:
-                    message_data = result["messages"][0]
-                    if message_data.get("status") == "0":
-                        return {
-                            "success": True,
-                            "message_id": message_data.get("message-id"),
-                            "to": to,
-                            "from": self.phone_number
-                        }
-                    else:
-                        error_text = message_data.get("error-text", "Unknown error")
-                        logger.error(f"Vonage message error: {error_text}")
-                        return {"success": False, "error": error_text}
+                return {"success": False, "error": "Failed to send SMS"}
+            
+            result = orjson.loads(response.content)
+            logger.info("Vonage response: %s", result)
+            
+            # Check if message was sent successfully
+            if result.get("messages"):
+                message_data = result["messages"][0]
+                if message_data.get("status") == "0":
+                    return {
+                        "success": True,
+                        "message_id": message_data.get("message-id"),
+                        "to": to,
+                        "from": self.phone_number
+                    }
                 else:
-                    return {"success": False, "error": "Invalid response from Vonage"}
-                    
+                    error_text = message_data.get("error-text", "Unknown error")
+                    logger.error(f"Vonage message error: {error_text}")
+                    return {"success": False, "error": error_text}
+            else:
+                return {"success": False, "error": "Invalid response from Vonage"}
+                
         except httpx.RequestError as e:
             logger.error(f"HTTP request error: {e}")
             return {"success": False, "error": "Network error"}
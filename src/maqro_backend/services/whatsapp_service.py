@@ -9,9 +9,16 @@ from ..core.config import settings
 from ..utils.phone_utils import normalize_phone_number
 import logging
 import json
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Keep enough warm connections for bursts of outbound replies
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Error bodies are only logged, so cap how much of them we decode and keep
+_MAX_ERROR_BODY_CHARS = 500
+
 
 class WhatsAppService:
     """Service for handling WhatsApp Business API operations"""
@@ -23,6 +30,26 @@ class WhatsAppService:
         self.app_secret = settings.whatsapp_app_secret
         self.api_version = settings.whatsapp_api_version
         self.base_url = f"https://graph.facebook.com/{self.api_version}"
+        # Parsed once; relative to base_url on the pooled client
+        self._messages_url = httpx.URL(f"/{self.phone_number_id}/messages")
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=30.0,
+                limits=_HTTP_LIMITS,
+                headers={"Authorization": f"Bearer {self.access_token}"}
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     def _validate_credentials(self) -> bool:
         """Validate that all required WhatsApp credentials are available"""
@@ -58,44 +85,39 @@ class WhatsAppService:
             }
         }
         
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-        
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/{self.phone_number_id}/messages",
-                    json=payload,
-                    headers=headers,
-                    timeout=30.0
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"WhatsApp API error: {response.status_code} - {response.text}")
-                    return {
-                        "success": False, 
-                        "error": f"API error: {response.status_code}",
-                        "details": response.text
-                    }
-                
-                result = response.json()
-                logger.info(f"WhatsApp response: {result}")
+            # Reuse pooled connections instead of a new TLS handshake per message
+            client = self._get_client()
+            response = await client.post(
+                self._messages_url,
+                json=payload
+            )
+            
+            if response.status_code != 200:
+                error_body = response.text[:_MAX_ERROR_BODY_CHARS]
+                logger.error("WhatsApp API error: %s - %s", response.status_code, error_body)
+                return {
+                    "success": False, 
+                    "error": f"API error: {response.status_code}",
+                    "details": error_body
+                }
+            
+            result = orjson.loads(response.content)
+            logger.info("WhatsApp response: %s", result)
+            
+            # Check if message was sent successfully
+            if result.get("messages"):
+                message_data = result["messages"][0]
+                return {
+                    "success": True,
+                    "message_id": message_data.get("id"),
+                    "to": to,
+                    "status": "sent"
+                }
+            else:
+                logger.error(f"Invalid response from WhatsApp API: {result}")
+                return {"success": False, "error": "Invalid response from WhatsApp"}
                 
-                # Check if message was sent successfully
-                if result.get("messages") and len(result["messages"]) > 0:
-                    message_data = result["messages"][0]
-                    return {
-                        "success": True,
-                        "message_id": message_data.get("id"),
-                        "to": to,
-                        "status": "sent"
-                    }
-                else:
-                    logger.error(f"Invalid response from WhatsApp API: {result}")
-                    return {"success": False, "error": "Invalid response from WhatsApp"}
-                    
         except httpx.TimeoutException:
             logger.error("WhatsApp API request timeout")
             return {"success": False, "error": "Request timeout"}
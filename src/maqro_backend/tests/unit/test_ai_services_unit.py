@@ -0,0 +1,31 @@
+from maqro_backend.services.ai_services import _extract_preferences
+
+
+# --- Preference extraction from customer messages ---
+def test_extract_preferences_exact_case_categories():
+    messages = ["I want a Red SUV with Leather", "Hybrid or Electric please", "Maybe an Automatic"]
+
+    preferences = _extract_preferences(messages)
+
+    # Color, transmission, fuel type and features only match exact-case keywords
+    assert preferences == {'body_style': ['suv']}
+
+
+def test_extract_preferences_case_insensitive_categories():
+    messages = ["Looking at a Honda Civic or a Toyota", "red sedan with leather"]
+
+    preferences = _extract_preferences(messages)
+
+    assert preferences == {
+        'color': ['red'],
+        'body_style': ['sedan'],
+        'features': ['leather'],
+        'make': ['toyota', 'honda'],
+        'model': ['civic'],
+    }
+
+
+def test_extract_preferences_body_style_ignores_case():
+    preferences = _extract_preferences(["SUV and sedan"])
+
+    assert preferences == {'body_style': ['sedan', 'suv']}
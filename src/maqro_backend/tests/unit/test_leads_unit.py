@@ -9,6 +9,9 @@ import pytz
 # A single TestClient instance is used for all tests in this file
 client = TestClient(app)
 
+# Fixed timestamp for mock records; keeps runs deterministic
+NOW = datetime(2024, 1, 1, 12, 0, 0, tzinfo=pytz.utc)
+
 # --- Test for POST /api/leads ---
 @pytest.mark.asyncio
 async def test_create_lead_unit():
@@ -58,10 +61,10 @@ async def test_get_all_leads_unit():
     mock_lead_1.car_interest = "Car A"
     mock_lead_1.source = "Website"
     mock_lead_1.status = "New"
-    mock_lead_1.last_contact_at = datetime.now(pytz.utc)
+    mock_lead_1.last_contact_at = NOW
     mock_lead_1.message = "Message 1"
     mock_lead_1.user_id = "test-user-1"
-    mock_lead_1.created_at = datetime.now(pytz.utc)
+    mock_lead_1.created_at = NOW
 
     with patch('maqro_backend.api.routes.leads.get_all_leads_ordered', new_callable=AsyncMock) as mock_get_from_db:
         mock_get_from_db.return_value = [mock_lead_1]
@@ -97,7 +100,7 @@ async def test_get_lead_by_id_success():
     mock_lead.id = "lead-uuid-1"
     mock_lead.name = "My Lead"
     mock_lead.email="my@lead.com"; mock_lead.phone="222"; mock_lead.car_interest="Car B"; 
-    mock_lead.source="Test"; mock_lead.status="Active"; mock_lead.last_contact_at=datetime.now(pytz.utc); mock_lead.message="Hi"; mock_lead.created_at=datetime.now(pytz.utc)
+    mock_lead.source="Test"; mock_lead.status="Active"; mock_lead.last_contact_at=NOW; mock_lead.message="Hi"; mock_lead.created_at=NOW
 
     with patch('maqro_backend.api.routes.leads.get_lead_by_id', new_callable=AsyncMock) as mock_get_from_db:
         mock_get_from_db.return_value = mock_lead
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from maqro_rag.config import Config, VectorStoreConfig
+from maqro_rag.vector_store import FAISSVectorStore
+
+DIMENSION = 64
+TOP_K = 3
+
+
+def build_store(vectors, precision, index_type):
+    config = Config(vector_store=VectorStoreConfig(
+        dimension=DIMENSION, precision=precision, index_type=index_type
+    ))
+    store = FAISSVectorStore(config)
+    store.add_vectors(vectors, [{"id": i} for i in range(len(vectors))])
+    return store
+
+
+def top_ids(store, query):
+    _, metadata = store.search(query, TOP_K)
+    return {meta["id"] for meta in metadata}
+
+
+# --- int8 recall against the exact fp32 index ---
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_quantized_retrieval(index_type):
+    # Arrange: seeded clustered vectors, so runs are deterministic and
+    # neighbours are meaningful rather than uniformly random
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((20, DIMENSION)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), 2000)] + 0.3 * rng.standard_normal((2000, DIMENSION)).astype(np.float32)
+    queries = vectors[rng.choice(len(vectors), 50, replace=False)] + 0.1 * rng.standard_normal((50, DIMENSION)).astype(np.float32)
+
+    exact = build_store(vectors, "fp32", "flat")
+    quantized = build_store(vectors, "int8", index_type)
+
+    # Act: top-3 Jaccard overlap for every query
+    overlaps = []
+    for query in queries:
+        expected, actual = top_ids(exact, query), top_ids(quantized, query)
+        overlaps.append(len(expected & actual) / len(expected | actual))
+
+    # Assert
+    assert np.mean(overlaps) >= 0.66
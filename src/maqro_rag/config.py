@@ -3,6 +3,7 @@ Configuration management for Maqro RAG module.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field
@@ -12,6 +13,16 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Prefer the libyaml C loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=8)
+def _load_yaml(config_file: Path, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML file once per path and modification time."""
+    with open(config_file, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
 
 class EmbeddingConfig(BaseModel):
     """Configuration for embedding providers."""
@@ -20,12 +31,18 @@ class EmbeddingConfig(BaseModel):
     cohere_model: Optional[str] = Field(default=None, description="Cohere model name")
     batch_size: int = Field(default=100, description="Batch size for embedding requests")
     max_retries: int = Field(default=3, description="Maximum retries for API calls")
+    max_concurrency: int = Field(default=4, description="Maximum concurrent embedding requests")
 
 
 class VectorStoreConfig(BaseModel):
     """Configuration for vector store."""
     type: str = Field(default="faiss", description="Vector store type: 'faiss', 'pinecone', 'weaviate'")
     dimension: int = Field(default=1536, description="Embedding dimension")
+    precision: str = Field(default="fp32", description="FAISS vector precision: 'fp32', 'fp16' or 'int8'")
+    index_type: str = Field(default="flat", description="FAISS index type: 'flat' (exact) or 'hnsw' (approximate)")
+    hnsw_m: int = Field(default=32, description="HNSW graph neighbors per node")
+    hnsw_ef_construction: int = Field(default=200, description="HNSW candidate list size while building")
+    hnsw_ef_search: int = Field(default=64, description="HNSW candidate list size while searching")
     pinecone: Optional[Dict[str, str]] = Field(default=None, description="Pinecone configuration")
     weaviate: Optional[Dict[str, str]] = Field(default=None, description="Weaviate configuration")
 
@@ -56,9 +73,10 @@ class Config(BaseModel):
         if not config_file.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         
-        with open(config_file, 'r') as f:
-            config_data = yaml.safe_load(f)
+        config_file = config_file.resolve()
+        config_data = _load_yaml(config_file, config_file.stat().st_mtime_ns)
         
+        # Each call still gets its own Config built from the cached data
         return cls(**config_data)
 
     @classmethod
@@ -70,11 +88,14 @@ class Config(BaseModel):
                 model=os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002"),
                 cohere_model=os.getenv("COHERE_MODEL"),
                 batch_size=int(os.getenv("BATCH_SIZE", "100")),
-                max_retries=int(os.getenv("MAX_RETRIES", "3"))
+                max_retries=int(os.getenv("MAX_RETRIES", "3")),
+                max_concurrency=int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
             ),
             vector_store=VectorStoreConfig(
                 type=os.getenv("VECTOR_STORE_TYPE", "faiss"),
-                dimension=int(os.getenv("VECTOR_DIMENSION", "1536"))
+                dimension=int(os.getenv("VECTOR_DIMENSION", "1536")),
+                precision=os.getenv("VECTOR_PRECISION", "fp32"),
+                index_type=os.getenv("VECTOR_INDEX_TYPE", "flat")
             ),
             retrieval=RetrievalConfig(
                 top_k=int(os.getenv("TOP_K", "3")),
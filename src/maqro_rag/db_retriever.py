@@ -3,6 +3,7 @@ Database-aware RAG retriever using pgvector for vehicle search.
 """
 
 from typing import List, Dict, Any, Optional
+import numpy as np
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -84,9 +85,9 @@ class DatabaseRAGRetriever:
                     'dealership_id': dealership_id
                 })
             
-            # Generate embeddings in batch
+            # Generate embeddings in concurrent batches without blocking the event loop
             logger.info("Generating embeddings...")
-            embeddings = self.embedding_provider.embed_texts(formatted_texts)
+            embeddings = await self.embedding_provider.embed_texts_async(formatted_texts)
             
             # Add embeddings to data
             for i, embedding in enumerate(embeddings):
@@ -103,15 +104,24 @@ class DatabaseRAGRetriever:
             logger.error(f"Error building embeddings: {e}")
             raise
     
+    async def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed several search queries in one batched provider call."""
+        return await self.embedding_provider.embed_texts_async(queries)
+    
     async def search_vehicles(
         self,
         session: AsyncSession,
         query: str,
         dealership_id: str,
         top_k: int = 5,
-        similarity_threshold: float = 0.3
+        similarity_threshold: float = 0.3,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict[str, Any]]:
-        """Search vehicles using database vector similarity."""
+        """Search vehicles using database vector similarity.
+        
+        Pass query_embedding when it was already computed (e.g. with
+        embed_queries) to skip embedding the query again.
+        """
         try:
             if not query.strip():
                 raise ValueError("Search query cannot be empty")
@@ -119,7 +129,8 @@ class DatabaseRAGRetriever:
             logger.info(f"Searching vehicles for: '{query}' in dealership {dealership_id}")
             
             # Generate query embedding
-            query_embedding = self.embedding_provider.embed_text(query)
+            if query_embedding is None:
+                query_embedding = self.embedding_provider.embed_text(query)
             
             # Search similar vehicles in database
             results = await self.vector_store.similarity_search(
@@ -148,7 +159,8 @@ class DatabaseRAGRetriever:
         query: str,
         vehicle_query: VehicleQuery,
         dealership_id: str,
-        top_k: int = 5
+        top_k: int = 5,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict[str, Any]]:
         """Hybrid search: SQL metadata filters BEFORE vector similarity."""
         try:
@@ -157,11 +169,13 @@ class DatabaseRAGRetriever:
             # If we have strong signals, use SQL pre-filtering
             if vehicle_query.has_strong_signals:
                 return await self._search_with_sql_filters(
-                    session, query, vehicle_query, dealership_id, top_k
+                    session, query, vehicle_query, dealership_id, top_k, query_embedding
                 )
             else:
                 # Fallback to regular vector search for weak signals
-                return await self.search_vehicles(session, query, dealership_id, top_k)
+                return await self.search_vehicles(
+                    session, query, dealership_id, top_k, query_embedding=query_embedding
+                )
             
         except Exception as e:
             logger.error(f"Error in hybrid search: {e}")
@@ -179,7 +193,8 @@ class DatabaseRAGRetriever:
         query: str,
         vehicle_query: VehicleQuery,
         dealership_id: str,
-        top_k: int
+        top_k: int,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict[str, Any]]:
         """Perform vector search with SQL metadata pre-filtering."""
         from sqlalchemy import text
@@ -188,7 +203,8 @@ class DatabaseRAGRetriever:
         where_conditions, params = self._build_sql_filters(vehicle_query, dealership_id)
         
         # Generate query embedding
-        query_embedding = self.embedding_provider.embed_text(query)
+        if query_embedding is None:
+            query_embedding = self.embedding_provider.embed_text(query)
         
         # Convert embedding to pgvector format
         if hasattr(query_embedding, 'tolist'):
@@ -64,9 +64,20 @@ class DatabaseVectorStore:
         session: AsyncSession, 
         embeddings_data: List[Dict[str, Any]]
     ) -> List[str]:
-        """Store multiple embeddings in a single transaction."""
+        """Store multiple embeddings in a single transaction.
+        
+        All rows go in one INSERT ... SELECT FROM unnest(...) statement with the
+        vectors bound as parameters, so the batch costs one round trip and one
+        statement parse instead of one of each per row.
+        """
+        if not embeddings_data:
+            return []
+        
         try:
-            embedding_ids = []
+            inventory_ids = []
+            embeddings = []
+            formatted_texts = []
+            dealership_ids = []
             
             for data in embeddings_data:
                 # Convert embedding to pgvector format (handle numpy arrays)
@@ -75,23 +86,32 @@ class DatabaseVectorStore:
                     embedding_list = embedding.tolist()
                 else:
                     embedding_list = list(embedding)
-                embedding_str = f"[{','.join(map(str, embedding_list))}]"
                 
-                result = await session.execute(
-                    text(f"""
-                    INSERT INTO vehicle_embeddings (inventory_id, embedding, formatted_text, dealership_id)
-                    VALUES (:inventory_id, '{embedding_str}'::vector, :formatted_text, :dealership_id)
-                    RETURNING id
-                    """),
-                    {
-                        "inventory_id": data["inventory_id"],
-                        "formatted_text": data["formatted_text"],
-                        "dealership_id": data["dealership_id"]
-                    }
-                )
-                
-                embedding_id = result.scalar()
-                embedding_ids.append(str(embedding_id))
+                inventory_ids.append(str(data["inventory_id"]))
+                embeddings.append(f"[{','.join(map(str, embedding_list))}]")
+                formatted_texts.append(data["formatted_text"])
+                dealership_ids.append(str(data["dealership_id"]))
+            
+            result = await session.execute(
+                text("""
+                INSERT INTO vehicle_embeddings (inventory_id, embedding, formatted_text, dealership_id)
+                SELECT batch.inventory_id::uuid, batch.embedding::vector, batch.formatted_text, batch.dealership_id::uuid
+                FROM unnest(
+                    CAST(:inventory_ids AS text[]),
+                    CAST(:embeddings AS text[]),
+                    CAST(:formatted_texts AS text[]),
+                    CAST(:dealership_ids AS text[])
+                ) AS batch(inventory_id, embedding, formatted_text, dealership_id)
+                RETURNING id
+                """),
+                {
+                    "inventory_ids": inventory_ids,
+                    "embeddings": embeddings,
+                    "formatted_texts": formatted_texts,
+                    "dealership_ids": dealership_ids
+                }
+            )
+            embedding_ids = [str(embedding_id) for embedding_id in result.scalars()]
             
             await session.commit()
             logger.info(f"Stored {len(embedding_ids)} embeddings in batch")
@@ -3,18 +3,12 @@ Embedding providers for converting text to vectors.
 """
 
 import os
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Optional
 import numpy as np
 from loguru import logger
 
-# Load environment variables
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
-
 try:
     import openai
 except ImportError:
@@ -25,6 +19,7 @@ try:
 except ImportError:
     cohere = None
 
+# Environment variables from .env are loaded once, when .config is imported
 from .config import Config
 
 
@@ -40,6 +35,10 @@ class EmbeddingProvider(ABC):
     def embed_text(self, text: str) -> np.ndarray:
         """Embed a single text into a vector."""
         pass
+    
+    async def embed_texts_async(self, texts: List[str]) -> np.ndarray:
+        """Embed a list of texts without blocking the event loop."""
+        return await asyncio.to_thread(self.embed_texts, texts)
 
 
 class OpenAIEmbeddingProvider(EmbeddingProvider):
@@ -60,6 +59,7 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         self.model = config.embedding.model
         self.batch_size = config.embedding.batch_size
         self.max_retries = config.embedding.max_retries
+        self.max_concurrency = config.embedding.max_concurrency
         
         logger.info(f"Initialized OpenAI embedding provider with model: {self.model}")
     
@@ -91,6 +91,36 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         
         return np.array(embeddings, dtype=np.float32)
     
+    async def embed_texts_async(self, texts: List[str]) -> np.ndarray:
+        """Embed a list of texts using concurrent OpenAI API requests."""
+        if not texts:
+            return np.array([])
+        
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        # The client's connection pool is bound to the running event loop, and
+        # callers may use a fresh asyncio.run() loop each time, so open one per call
+        async with openai.AsyncOpenAI(api_key=self.api_key) as client:
+            async def embed_batch(batch_num: int, batch: List[str]) -> List[List[float]]:
+                async with semaphore:
+                    logger.info(f"Embedding batch {batch_num}/{len(batches)} ({len(batch)} texts)")
+                    try:
+                        response = await client.embeddings.create(
+                            model=self.model,
+                            input=batch
+                        )
+                    except Exception as e:
+                        logger.error(f"Error embedding batch {batch_num}: {e}")
+                        raise
+                    return [embedding.embedding for embedding in response.data]
+            
+            results = await asyncio.gather(*[
+                embed_batch(batch_num, batch) for batch_num, batch in enumerate(batches, 1)
+            ])
+        
+        return np.array([embedding for batch in results for embedding in batch], dtype=np.float32)
+    
     def embed_text(self, text: str) -> np.ndarray:
         """Embed a single text using OpenAI API."""
         if not text.strip():
@@ -4,8 +4,10 @@ Inventory processing for vehicle data.
 
 import csv
 import re
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Dict, Any, Tuple, Optional
+import orjson
 from loguru import logger
 
 from .config import Config
@@ -166,7 +168,7 @@ class VehicleData:
         if any(term in description_lower or term in features_lower for term in ['hybrid', 'electric', 'ev', 'phev', 'plug-in']):
             semantic_terms.extend(['eco-friendly', 'fuel efficient', 'green vehicle', 'environmentally friendly'])
         
-        return list(set(semantic_terms))  # Remove duplicates
+        return list(dict.fromkeys(semantic_terms))  # Remove duplicates, keep a stable order
     
     def _get_price_category(self, price: int) -> str:
         """Get semantic price category."""
@@ -279,6 +281,11 @@ class VehicleData:
 class InventoryProcessor:
     """Process vehicle inventory data for RAG system."""
     
+    # Cleaned rows keyed by (path, mtime, size), shared by all processors so an
+    # unchanged file is only parsed once
+    _csv_cache: "OrderedDict[Tuple[str, int, int], List[Dict[str, Any]]]" = OrderedDict()
+    _CSV_CACHE_SIZE = 4
+    
     def __init__(self, config: Config):
         """Initialize inventory processor."""
         self.config = config
@@ -291,6 +298,14 @@ class InventoryProcessor:
         if not file_path.exists():
             raise FileNotFoundError(f"Inventory file not found: {file_path}")
         
+        stat = file_path.stat()
+        cache_key = (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+        cached = self._csv_cache.get(cache_key)
+        if cached is not None:
+            self._csv_cache.move_to_end(cache_key)
+            logger.info(f"Loaded {len(cached)} vehicles from {file_path} (cached)")
+            return [dict(row) for row in cached]
+        
         vehicles = []
         
         try:
@@ -308,7 +323,11 @@ class InventoryProcessor:
                         continue
             
             logger.info(f"Loaded {len(vehicles)} vehicles from {file_path}")
-            return vehicles
+            self._csv_cache[cache_key] = vehicles
+            if len(self._csv_cache) > self._CSV_CACHE_SIZE:
+                self._csv_cache.popitem(last=False)
+            # Callers get their own copies so the cached rows stay pristine
+            return [dict(row) for row in vehicles]
             
         except Exception as e:
             logger.error(f"Error loading CSV file: {e}")
@@ -491,11 +510,12 @@ class InventoryProcessor:
     
     def export_processed_data(self, output_path: str) -> None:
         """Export processed data to JSON file."""
-        import json
-        
         try:
-            with open(output_path, 'w') as f:
-                json.dump(self._processed_data, f, indent=2)
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(
+                    self._processed_data,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                ))
             logger.info(f"Exported processed data to {output_path}")
         except Exception as e:
             logger.error(f"Error exporting data: {e}")
@@ -2,8 +2,10 @@
 Centralized prompt builder for conversational RAG responses.
 """
 
-from typing import Dict, Any, List, Optional
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 from loguru import logger
 
 
@@ -26,6 +28,116 @@ class AgentConfig:
         )
 
 
+# Few-shot examples are static, so build them once for all PromptBuilder instances
+_FEW_SHOT_EXAMPLE_DATA = {
+    "grounded": [
+        {
+            "input": "Is the 2022 Tiguan SE in white still available?",
+            "output": "Yes! We have that 2022 Tiguan SE in white at $29,900 with only 28k miles. It's clean and ready to go. Want to swing by today 5:30 or tomorrow 10:00 at our Mission Bay Auto for a quick spin?\n{\"next_action\":\"offer_test_drive\",\"proposed_slots\":[\"2025-08-12T17:30:00-07:00\",\"2025-08-13T10:00:00-07:00\"],\"location_label\":\"Mission Bay Auto\",\"confidence\":0.9}"
+        },
+        {
+            "input": "Looking for an SUV",
+            "output": "Great! I've got a few SUVs in stock. What's your budget range?\n{\"next_action\":\"ask_clarify\",\"confidence\":0.8}"
+        },
+        {
+            "input": "What's your best deal on a sedan?",
+            "output": "I've got a 2021 Honda Civic EX in blue for $19,800 with 35k miles - great value! Also have a 2022 Toyota Camry SE for $24,500. Want to see either today 5:30 or tomorrow 10:00?\n{\"next_action\":\"offer_test_drive\",\"proposed_slots\":[\"2025-08-12T17:30:00-07:00\",\"2025-08-13T10:00:00-07:00\"],\"location_label\":\"Mission Bay Auto\",\"confidence\":0.88}"
+        },
+        {
+            "input": "Thanks, have a great day",
+            "output": "You too! Have a wonderful day. Feel free to reach out anytime if you need anything.\n{\"next_action\":\"end_conversation\",\"confidence\":0.95}"
+        }
+    ],
+    "generic": [
+        {
+            "input": "Any 3-row SUV under 30k?",
+            "output": "I've got a 2021 Honda Pilot EX-L for $28,500 and a 2020 Toyota Highlander for $29,200. Both have third rows and are under your budget. Want to check them out today 6:00 or tomorrow 9:30?\n{\"next_action\":\"offer_test_drive\",\"proposed_slots\":[\"2025-08-12T18:00:00-07:00\",\"2025-08-13T09:30:00-07:00\"],\"location_label\":\"Mission Bay Auto\",\"confidence\":0.82}"
+        },
+        {
+            "input": "Hey, my name is Aryan and I am interested in sedans.",
+            "output": "Hey Aryan! Nice to meet you. What's your budget range for a sedan?\n{\"next_action\":\"ask_clarify\",\"confidence\":0.8}"
+        },
+        {
+            "input": "Around 30k",
+            "output": "Perfect! I've got a 2022 Tiguan SE for $29,900 and a 2021 Honda CR-V for $25,500. Both are in great shape. Want to check them out today 6:00 or tomorrow 9:45?\n{\"next_action\":\"offer_test_drive\",\"proposed_slots\":[\"2025-08-12T18:00:00-07:00\",\"2025-08-13T09:45:00-07:00\"],\"location_label\":\"Mission Bay Auto\",\"confidence\":0.85}"
+        },
+        {
+            "input": "Under 25k",
+            "output": "Great! I've got a 2021 Honda Civic EX for $19,800 and a 2020 Toyota Corolla for $18,500. Both are reliable and under your budget. Want to see them today 6:00 or tomorrow 9:45?\n{\"next_action\":\"offer_test_drive\",\"proposed_slots\":[\"2025-08-12T18:00:00-07:00\",\"2025-08-13T09:45:00-07:00\"],\"location_label\":\"Mission Bay Auto\",\"confidence\":0.85}"
+        },
+        {
+            "input": "Goodbye, thanks for your help",
+            "output": "You're welcome! Have a great day. Don't hesitate to reach out if you need anything else.\n{\"next_action\":\"end_conversation\",\"confidence\":0.95}"
+        }
+    ]
+}
+# Shared by every instance, so freeze it into a read-only view
+_FEW_SHOT_EXAMPLES: Mapping[str, Tuple[Mapping[str, str], ...]] = MappingProxyType({
+    example_type: tuple(MappingProxyType(example) for example in examples)
+    for example_type, examples in _FEW_SHOT_EXAMPLE_DATA.items()
+})
+
+
+@lru_cache(maxsize=32)
+def _system_prompt_for(dealership_name: str) -> str:
+    """Render the system prompt; only the dealership name varies, so cache per name."""
+    return f"""ROLE
+You are a friendly, persuasive car salesperson at {dealership_name}. You text like a human: short, natural sentences, contractions, no corporate jargon.
+
+PRIMARY OUTCOME
+Book test drives and sell cars. Be proactive but conversational - ask ONE question at a time and respond to their answer before moving forward.
+
+STYLE
+- SMS tone: 2–5 short sentences. No bullet lists. No long paragraphs.
+- Personal, confident, helpful. Use the customer's name if available.
+- Reference specific details (year/trim/price/mileage) from retrieved data. Be specific about what you have.
+- Ask ONE question at a time and wait for their response.
+- Build conversation naturally - don't bombard with multiple questions.
+
+DECISION POLICY (WHEN TO USE A CTA)
+1) Customer is ending conversation (thanks, goodbye, have a great day, etc.):
+   - Acknowledge warmly and end conversation naturally
+   - NO sales push or offers
+   - Use next_action: "end_conversation"
+
+2) Customer shows interest (looking for, interested in, want, need, etc.):
+   - If you have matching vehicles: Offer them immediately with test drive CTA
+   - If vague but you have relevant inventory: Suggest specific cars and offer test drive
+   - If no relevant inventory: Ask ONE clarifying question and wait for response
+
+3) Customer answers a question (budget, preferences, timing):
+   - Respond to their answer and offer relevant vehicles
+   - Don't ask another question immediately - offer what matches their answer
+
+4) Customer asks specific questions (features, availability, price):
+   - Answer and immediately offer test drive with specific time slots
+
+5) Customer hesitates ("not now", "maybe later"):
+   - Acknowledge and offer a low-friction slot (10–15 min spin)
+
+6) No suitable inventory:
+   - Offer what you DO have that's close, or ask ONE clarifying question
+
+CTAs (BE CONVERSATIONAL)
+- Offer test drives when customer shows interest
+- Don't push sales when customer is ending conversation
+- Ask ONE question at a time and wait for response
+- Make it easy: "Want to swing by today 5:30 or tomorrow 10:00?"
+- Include {dealership_name} location
+
+SAFETY / HONESTY
+- Never invent specifics. If unsure, say "I'll double-check."
+- Only reference vehicles you actually have in inventory
+
+OUTPUT SHAPE
+- Natural text reply (2–5 sentences), followed by a compact control object on the final line:
+  JSON: {{"next_action":"<ask_clarify|offer_test_drive|confirm_test_drive|end_conversation>",
+         "proposed_slots":["ISO1","ISO2"],
+         "location_label":"{dealership_name}",
+         "confidence": 0.0-1.0}}
+- Use ask_clarify for ONE question, then wait for response"""
+
+
 class PromptBuilder:
     """Builder for conversational prompts with SMS-style responses."""
     
@@ -60,20 +172,36 @@ class PromptBuilder:
             conversation_context = self._format_conversation_context(conversation_history)
         
         # Build user prompt
-        user_prompt = f"""Customer message: "{user_message}"
-
-Available vehicles:
-{cars_text}
-
-Please respond in a conversational, SMS-style manner. Keep it to 2-5 short sentences with one clear next step or question."""
+        user_prompt = self._build_grounded_user_prompt(user_message, cars_text)
 
         # Combine all parts
-        full_prompt = f"{system_prompt}\n\n{examples}"
-        if conversation_context:
-            full_prompt += f"\n\n{conversation_context}"
-        full_prompt += f"\n\n{user_prompt}"
-
-        return full_prompt
+        return self._join_prompt_parts(system_prompt, examples, conversation_context, user_prompt)
+    
+    def build_grounded_prompts(
+        self,
+        items: List[Tuple[str, List[Dict[str, Any]]]],
+        agent_config: Optional[AgentConfig] = None
+    ) -> List[str]:
+        """Build grounded prompts for several (user_message, retrieved_cars) pairs.
+        
+        The system prompt and few-shot examples are built once and shared by
+        every prompt in the batch.
+        """
+        if agent_config is None:
+            agent_config = self.agent_config
+        
+        system_prompt = self._build_system_prompt(agent_config)
+        examples = self._get_relevant_examples("grounded")
+        
+        return [
+            self._join_prompt_parts(
+                system_prompt,
+                examples,
+                "",
+                self._build_grounded_user_prompt(user_message, self._format_cars_for_prompt(retrieved_cars))
+            )
+            for user_message, retrieved_cars in items
+        ]
     
     def build_generic_prompt(
         self, 
@@ -102,72 +230,32 @@ Please respond in a conversational, SMS-style manner. Keep it to 2-5 short sente
 No specific vehicles found in inventory. Please respond helpfully and ask a clarifying question to better understand their needs."""
 
         # Combine all parts
-        full_prompt = f"{system_prompt}\n\n{examples}"
-        if conversation_context:
-            full_prompt += f"\n\n{conversation_context}"
-        full_prompt += f"\n\n{user_prompt}"
+        return self._join_prompt_parts(system_prompt, examples, conversation_context, user_prompt)
+    
+    @staticmethod
+    def _build_grounded_user_prompt(user_message: str, cars_text: str) -> str:
+        """Build the user section of a grounded prompt."""
+        return f"""Customer message: "{user_message}"
 
-        return full_prompt
+Available vehicles:
+{cars_text}
+
+Please respond in a conversational, SMS-style manner. Keep it to 2-5 short sentences with one clear next step or question."""
+    
+    @staticmethod
+    def _join_prompt_parts(
+        system_prompt: str, examples: str, conversation_context: str, user_prompt: str
+    ) -> str:
+        """Join prompt sections with blank lines in a single pass."""
+        parts = [system_prompt, examples]
+        if conversation_context:
+            parts.append(conversation_context)
+        parts.append(user_prompt)
+        return "\n\n".join(parts)
     
     def _build_system_prompt(self, agent_config: AgentConfig) -> str:
         """Build the system prompt with agent configuration."""
-        system_prompt = f"""ROLE
-You are a friendly, persuasive car salesperson at {agent_config.dealership_name}. You text like a human: short, natural sentences, contractions, no corporate jargon.
-
-PRIMARY OUTCOME
-Book test drives and sell cars. Be proactive but conversational - ask ONE question at a time and respond to their answer before moving forward.
-
-STYLE
-- SMS tone: 2–5 short sentences. No bullet lists. No long paragraphs.
-- Personal, confident, helpful. Use the customer's name if available.
-- Reference specific details (year/trim/price/mileage) from retrieved data. Be specific about what you have.
-- Ask ONE question at a time and wait for their response.
-- Build conversation naturally - don't bombard with multiple questions.
-
-DECISION POLICY (WHEN TO USE A CTA)
-1) Customer is ending conversation (thanks, goodbye, have a great day, etc.):
-   - Acknowledge warmly and end conversation naturally
-   - NO sales push or offers
-   - Use next_action: "end_conversation"
-
-2) Customer shows interest (looking for, interested in, want, need, etc.):
-   - If you have matching vehicles: Offer them immediately with test drive CTA
-   - If vague but you have relevant inventory: Suggest specific cars and offer test drive
-   - If no relevant inventory: Ask ONE clarifying question and wait for response
-
-3) Customer answers a question (budget, preferences, timing):
-   - Respond to their answer and offer relevant vehicles
-   - Don't ask another question immediately - offer what matches their answer
-
-4) Customer asks specific questions (features, availability, price):
-   - Answer and immediately offer test drive with specific time slots
-
-5) Customer hesitates ("not now", "maybe later"):
-   - Acknowledge and offer a low-friction slot (10–15 min spin)
-
-6) No suitable inventory:
-   - Offer what you DO have that's close, or ask ONE clarifying question
-
-CTAs (BE CONVERSATIONAL)
-- Offer test drives when customer shows interest
-- Don't push sales when customer is ending conversation
-- Ask ONE question at a time and wait for response
-- Make it easy: "Want to swing by today 5:30 or tomorrow 10:00?"
-- Include {agent_config.dealership_name} location
-
-SAFETY / HONESTY
-- Never invent specifics. If unsure, say "I'll double-check."
-- Only reference vehicles you actually have in inventory
-
-OUTPUT SHAPE
-- Natural text reply (2–5 sentences), followed by a compact control object on the final line:
-  JSON: {{"next_action":"<ask_clarify|offer_test_drive|confirm_test_drive|end_conversation>",
-         "proposed_slots":["ISO1","ISO2"],
-         "location_label":"{agent_config.dealership_name}",
-         "confidence": 0.0-1.0}}
-- Use ask_clarify for ONE question, then wait for response"""
-        
-        return system_prompt
+        return _system_prompt_for(agent_config.dealership_name)
     
     def _format_cars_for_prompt(self, cars: List[Dict[str, Any]]) -> str:
         """Format retrieved cars for prompt inclusion."""
@@ -190,16 +278,16 @@ OUTPUT SHAPE
             price_str = f"${price:,}" if price else "Price available upon request"
             mileage_str = f"{mileage:,} miles" if mileage else "Mileage available upon request"
             
-            car_text = f"{i}. {year} {make} {model}"
+            car_parts = [f"{i}. {year} {make} {model}"]
             if color:
-                car_text += f" in {color}"
-            car_text += f" - {price_str}, {mileage_str}"
+                car_parts.append(f" in {color}")
+            car_parts.append(f" - {price_str}, {mileage_str}")
             
             if features:
-                car_text += f" (Features: {features})"
+                car_parts.append(f" (Features: {features})")
             
-            car_text += f" [Match: {score:.1%}]"
-            formatted_cars.append(car_text)
+            car_parts.append(f" [Match: {score:.1%}]")
+            formatted_cars.append("".join(car_parts))
         
         return "\n".join(formatted_cars)
     
@@ -229,62 +317,21 @@ OUTPUT SHAPE
         
         return "\n".join(context_parts)
     
-    def _get_few_shot_examples(self) -> Dict[str, List[Dict[str, str]]]:
+    def _get_few_shot_examples(self) -> Mapping[str, Tuple[Mapping[str, str], ...]]:
         """Get few-shot examples for different scenarios."""
-        return {
-            "grounded": [
-                {
-                    "input": "Is the 2022 Tiguan SE in white still available?",
-                    "output": "Yes! We have that 2022 Tiguan SE in white at $29,900 with only 28k miles. It's clean and ready to go. Want to swing by today 5:30 or tomorrow 10:00 at our Mission Bay Auto for a quick spin?\n{\"next_action\":\"offer_test_drive\",\"proposed_slots\":[\"2025-08-12T17:30:00-07:00\",\"2025-08-13T10:00:00-07:00\"],\"location_label\":\"Mission Bay Auto\",\"confidence\":0.9}"
-                },
-                {
-                    "input": "Looking for an SUV",
-                    "output": "Great! I've got a few SUVs in stock. What's your budget range?\n{\"next_action\":\"ask_clarify\",\"confidence\":0.8}"
-                },
-                {
-                    "input": "What's your best deal on a sedan?",
-                    "output": "I've got a 2021 Honda Civic EX in blue for $19,800 with 35k miles - great value! Also have a 2022 Toyota Camry SE for $24,500. Want to see either today 5:30 or tomorrow 10:00?\n{\"next_action\":\"offer_test_drive\",\"proposed_slots\":[\"2025-08-12T17:30:00-07:00\",\"2025-08-13T10:00:00-07:00\"],\"location_label\":\"Mission Bay Auto\",\"confidence\":0.88}"
-                },
-                {
-                    "input": "Thanks, have a great day",
-                    "output": "You too! Have a wonderful day. Feel free to reach out anytime if you need anything.\n{\"next_action\":\"end_conversation\",\"confidence\":0.95}"
-                }
-            ],
-            "generic": [
-                {
-                    "input": "Any 3-row SUV under 30k?",
-                    "output": "I've got a 2021 Honda Pilot EX-L for $28,500 and a 2020 Toyota Highlander for $29,200. Both have third rows and are under your budget. Want to check them out today 6:00 or tomorrow 9:30?\n{\"next_action\":\"offer_test_drive\",\"proposed_slots\":[\"2025-08-12T18:00:00-07:00\",\"2025-08-13T09:30:00-07:00\"],\"location_label\":\"Mission Bay Auto\",\"confidence\":0.82}"
-                },
-                {
-                    "input": "Hey, my name is Aryan and I am interested in sedans.",
-                    "output": "Hey Aryan! Nice to meet you. What's your budget range for a sedan?\n{\"next_action\":\"ask_clarify\",\"confidence\":0.8}"
-                },
-                {
-                    "input": "Around 30k",
-                    "output": "Perfect! I've got a 2022 Tiguan SE for $29,900 and a 2021 Honda CR-V for $25,500. Both are in great shape. Want to check them out today 6:00 or tomorrow 9:45?\n{\"next_action\":\"offer_test_drive\",\"proposed_slots\":[\"2025-08-12T18:00:00-07:00\",\"2025-08-13T09:45:00-07:00\"],\"location_label\":\"Mission Bay Auto\",\"confidence\":0.85}"
-                },
-                {
-                    "input": "Under 25k",
-                    "output": "Great! I've got a 2021 Honda Civic EX for $19,800 and a 2020 Toyota Corolla for $18,500. Both are reliable and under your budget. Want to see them today 6:00 or tomorrow 9:45?\n{\"next_action\":\"offer_test_drive\",\"proposed_slots\":[\"2025-08-12T18:00:00-07:00\",\"2025-08-13T09:45:00-07:00\"],\"location_label\":\"Mission Bay Auto\",\"confidence\":0.85}"
-                },
-                {
-                    "input": "Goodbye, thanks for your help",
-                    "output": "You're welcome! Have a great day. Don't hesitate to reach out if you need anything else.\n{\"next_action\":\"end_conversation\",\"confidence\":0.95}"
-                }
-            ]
-        }
+        return _FEW_SHOT_EXAMPLES
     
     def _get_relevant_examples(self, example_type: str) -> str:
         """Get relevant few-shot examples for the prompt."""
-        examples = self.few_shot_examples.get(example_type, [])
+        examples = self.few_shot_examples.get(example_type, ())
         
         if not examples:
             return ""
         
-        examples_text = "--- FEW-SHOT MICRO-EXAMPLES ---\n\n"
+        examples_parts = ["--- FEW-SHOT MICRO-EXAMPLES ---\n\n"]
         for i, example in enumerate(examples, 1):
-            examples_text += f"{chr(64+i)}) {example['input']}\n"
-            examples_text += f"User: \"{example['input']}\"\n"
-            examples_text += f"Assistant: \"{example['output']}\"\n\n"
+            examples_parts.append(f"{chr(64+i)}) {example['input']}\n")
+            examples_parts.append(f"User: \"{example['input']}\"\n")
+            examples_parts.append(f"Assistant: \"{example['output']}\"\n\n")
         
-        return examples_text 
\ No newline at end of file
+        return "".join(examples_parts) 
\ No newline at end of file
@@ -6,6 +6,7 @@ import os
 import json
 from typing import List, Dict, Any, Callable, Optional, Tuple
 from dataclasses import dataclass
+import numpy as np
 from loguru import logger
 
 from .config import Config
@@ -140,14 +141,24 @@ class EnhancedRAGService:
             search_queries = self._generate_search_queries(query, context)
             
             # Perform searches
-            all_results = []
-            for search_query in search_queries:
+            all_results = None
+            if isinstance(self.retriever, VehicleRetriever) and len(search_queries) > 1:
                 try:
-                    results = self.retriever.search_vehicles(search_query, top_k)
-                    all_results.extend(results)
+                    # One embedding call and one index search for every variant
+                    result_lists = self.retriever.search_vehicles_batch(search_queries, top_k=top_k)
+                    all_results = self._fuse_results(result_lists)
                 except Exception as e:
-                    logger.warning(f"Error searching with query '{search_query}': {e}")
-                    continue
+                    logger.warning(f"Error in batched context search, searching variants one at a time: {e}")
+            
+            if all_results is None:
+                all_results = []
+                for search_query in search_queries:
+                    try:
+                        results = self.retriever.search_vehicles(search_query, top_k)
+                        all_results.extend(results)
+                    except Exception as e:
+                        logger.warning(f"Error searching with query '{search_query}': {e}")
+                        continue
             
             # Deduplicate and filter results
             deduplicated_results = self._deduplicate_results(all_results)
@@ -183,7 +194,30 @@ class EnhancedRAGService:
                 if isinstance(value, str):
                     queries.append(f"{query} {value}")
         
-        return list(set(queries))  # Remove duplicates
+        return list(dict.fromkeys(queries))  # Remove duplicates, keep order
+    
+    @staticmethod
+    def _vehicle_key(vehicle: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+        """Key identifying the same vehicle across result lists."""
+        return (vehicle.get('year'), vehicle.get('make'), vehicle.get('model'))
+    
+    def _fuse_results(self, result_lists: List[List[Dict[str, Any]]], k: int = 60) -> List[Dict[str, Any]]:
+        """Merge per-query result lists with reciprocal rank fusion.
+        
+        Each vehicle scores sum(1 / (k + rank)) over the lists it appears in;
+        the first hit seen for a vehicle is kept.
+        """
+        fused_scores: Dict[Tuple[Any, Any, Any], float] = {}
+        first_hits: Dict[Tuple[Any, Any, Any], Dict[str, Any]] = {}
+        
+        for results in result_lists:
+            for rank, result in enumerate(results, 1):
+                key = self._vehicle_key(result['vehicle'])
+                fused_scores[key] = fused_scores.get(key, 0.0) + 1.0 / (k + rank)
+                first_hits.setdefault(key, result)
+        
+        ordered_keys = sorted(fused_scores, key=fused_scores.get, reverse=True)
+        return [first_hits[key] for key in ordered_keys]
     
     def _deduplicate_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate vehicles from results."""
@@ -191,8 +225,7 @@ class EnhancedRAGService:
         unique_results = []
         
         for result in results:
-            vehicle = result['vehicle']
-            vehicle_key = f"{vehicle.get('year')}-{vehicle.get('make')}-{vehicle.get('model')}"
+            vehicle_key = self._vehicle_key(result['vehicle'])
             
             if vehicle_key not in seen_vehicles:
                 seen_vehicles.add(vehicle_key)
@@ -202,26 +235,31 @@ class EnhancedRAGService:
     
     def _apply_context_filters(self, results: List[Dict[str, Any]], context: ConversationContext) -> List[Dict[str, Any]]:
         """Apply context-based filters to results."""
-        filtered_results = []
+        if not results:
+            return []
         
-        for result in results:
-            vehicle = result['vehicle']
-            include = True
-            
-            # Budget filter
-            if context.budget_range and vehicle.get('price'):
-                min_price, max_price = context.budget_range
-                if not (min_price <= vehicle['price'] <= max_price):
-                    include = False
-            
-            # Vehicle type filter
-            if context.vehicle_type and context.vehicle_type.lower() not in vehicle.get('description', '').lower():
-                include = False
-            
-            if include:
-                filtered_results.append(result)
+        mask = np.ones(len(results), dtype=bool)
+        
+        # Budget filter, vectorized; vehicles without a price are kept
+        if context.budget_range:
+            min_price, max_price = context.budget_range
+            prices = np.fromiter(
+                (float(r['vehicle'].get('price') or np.nan) for r in results),
+                dtype=np.float64,
+                count=len(results)
+            )
+            mask &= np.isnan(prices) | ((prices >= min_price) & (prices <= max_price))
+        
+        # Vehicle type filter
+        if context.vehicle_type:
+            vehicle_type = context.vehicle_type.lower()
+            mask &= np.fromiter(
+                (vehicle_type in r['vehicle'].get('description', '').lower() for r in results),
+                dtype=bool,
+                count=len(results)
+            )
         
-        return filtered_results
+        return [results[i] for i in np.flatnonzero(mask).tolist()]
     
     def _rerank_by_context(self, results: List[Dict[str, Any]], context: ConversationContext) -> List[Dict[str, Any]]:
         """Rerank results based on context preferences."""
@@ -481,7 +519,7 @@ class EnhancedRAGService:
         
         # Completeness score based on response length and vehicle count
         response_length = len(response_text)
-        if response_length > 200 and len(vehicles) > 0:
+        if response_length > 200 and vehicles:
             quality.completeness_score = min(1.0, response_length / 500)
         
         # Personalization score based on context usage
@@ -497,8 +535,10 @@ class EnhancedRAGService:
         quality.personalization_score = min(1.0, context_usage)
         
         # Actionability score based on call-to-action presence
-        action_words = ['schedule', 'test drive', 'contact', 'call', 'visit', 'financing', 'payment']
-        action_count = sum(1 for word in action_words if word.lower() in response_text.lower())
+        # Lowercase once rather than once per action word
+        response_lower = response_text.lower()
+        action_words = ('schedule', 'test drive', 'contact', 'call', 'visit', 'financing', 'payment')
+        action_count = sum(1 for word in action_words if word in response_lower)
         quality.actionability_score = min(1.0, action_count / 3)
         
         return quality
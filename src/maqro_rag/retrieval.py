@@ -3,6 +3,10 @@ Vehicle retrieval system using vector similarity search.
 """
 
 import os
+import re
+import asyncio
+import hashlib
+from collections import Counter
 from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 from loguru import logger
@@ -14,6 +18,14 @@ from .inventory import InventoryProcessor
 from .entity_parser import VehicleQuery
 
 
+# Keyword sets used by validate_query
+_PRICE_TERMS = frozenset({'under', 'over', 'price'})
+_VEHICLE_TYPE_TERMS = frozenset({'sedan', 'suv', 'truck', 'car', 'vehicle'})
+_BRAND_TERMS = frozenset({'toyota', 'honda', 'ford', 'bmw', 'mercedes'})
+# Splits on punctuation too, so "toyota?" and "mercedes-benz" yield bare words
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
 class VehicleRetriever:
     """Retrieves vehicles using vector similarity search."""
     
@@ -38,9 +50,13 @@ class VehicleRetriever:
             if not formatted_texts:
                 raise ValueError("No vehicles found in inventory file")
             
+            # Record content hashes so update_index can skip unchanged vehicles
+            for text, meta in zip(formatted_texts, metadata):
+                meta['content_hash'] = self._content_hash(text)
+            
             # Create embeddings
             logger.info("Creating embeddings for vehicles...")
-            embeddings = self.embedding_provider.embed_texts(formatted_texts)
+            embeddings = self._embed_texts_concurrently(formatted_texts)
             
             # Add to vector store
             logger.info("Adding embeddings to vector store...")
@@ -58,6 +74,16 @@ class VehicleRetriever:
             logger.error(f"Error building index: {e}")
             raise
     
+    def _embed_texts_concurrently(self, texts: List[str]) -> np.ndarray:
+        """Embed texts with concurrent batch requests when no event loop is running."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.embedding_provider.embed_texts_async(texts))
+        
+        # Already inside an event loop (e.g. called from a request handler)
+        return self.embedding_provider.embed_texts(texts)
+    
     def load_index(self, index_path: str) -> None:
         """Load existing vector index."""
         try:
@@ -69,6 +95,30 @@ class VehicleRetriever:
             logger.error(f"Error loading index: {e}")
             raise
     
+    def load_or_build_index(self, inventory_file: str, index_path: str) -> bool:
+        """Load a saved index, rebuilding it only when the inventory is newer
+        or the vector store config asks for a different kind of index.
+        
+        Returns True if the index was rebuilt.
+        """
+        # .offsets is written last, so its absence means a missing or unfinished save
+        index_files = [f"{index_path}.faiss", f"{index_path}.metadata", f"{index_path}.offsets"]
+        if all(os.path.exists(path) for path in index_files):
+            built_at = min(os.path.getmtime(path) for path in index_files)
+            if os.path.getmtime(inventory_file) <= built_at:
+                self.load_index(index_path)
+                if self.vector_store.matches_config():
+                    return False
+                # config.yaml now asks for a different index type, precision or dimension
+                logger.info(f"Saved index at {index_path} does not match the vector store config, rebuilding")
+                self.vector_store = get_vector_store(self.config)
+                self.is_initialized = False
+            else:
+                logger.info(f"{inventory_file} changed since the index was saved, rebuilding")
+        
+        self.build_index(inventory_file, index_path)
+        return True
+    
     def search_vehicles(self, query: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
         """Search for vehicles using semantic similarity."""
         if not self.is_initialized:
@@ -89,81 +139,142 @@ class VehicleRetriever:
             scores, metadata = self.vector_store.search(query_embedding, top_k)
             
             # Format results
-            results = []
-            for i, (score, meta) in enumerate(zip(scores, metadata)):
-                # Handle different metadata structures defensively
-                if 'vehicle' in meta:
-                    vehicle_data = meta['vehicle']
-                else:
-                    # Fallback: use meta directly if 'vehicle' key missing
-                    vehicle_data = {
-                        'year': meta.get('year', ''),
-                        'make': meta.get('make', ''),
-                        'model': meta.get('model', ''),
-                        'price': meta.get('price', 0),
-                        'features': meta.get('features', ''),
-                        'description': meta.get('description', ''),
-                        'mileage': meta.get('mileage', 0),
-                        'color': meta.get('color', ''),
-                        'condition': meta.get('condition', ''),
-                        'fuel_type': meta.get('fuel_type', ''),
-                        'transmission': meta.get('transmission', ''),
-                        'doors': meta.get('doors', 0),
-                        'seats': meta.get('seats', 0),
-                        'engine': meta.get('engine', ''),
-                        'drivetrain': meta.get('drivetrain', '')
-                    }
-                
-                result = {
-                    'vehicle': vehicle_data,
-                    'similarity_score': float(score),
-                    'metadata': meta
-                }
-                results.append(result)
+            results = self._format_search_results(scores, metadata)
             
-            logger.info(f"Found {len(results)} vehicles matching query: '{query}'")
+            logger.info("Found {} vehicles matching query: '{}'", len(results), query)
             return results
             
         except Exception as e:
             logger.error(f"Error searching vehicles: {e}")
             raise
     
+    def encode_batch(self, queries: List[str]) -> np.ndarray:
+        """Embed several queries in one provider call as an (N, dimension) array."""
+        return np.asarray(self.embedding_provider.embed_texts(queries), dtype=np.float32)
+    
+    def search_vehicles_batch(
+        self,
+        queries: List[str],
+        vehicle_queries: Optional[List[Optional["VehicleQuery"]]] = None,
+        top_k: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for several queries with one embedding call and one index search.
+        
+        Queries whose parsed vehicle query has strong signals go through
+        search_vehicles_hybrid so metadata filters still apply.
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Vector index not initialized. Call build_index() or load_index() first.")
+        
+        if top_k is None:
+            top_k = self.config.retrieval.top_k
+        
+        if vehicle_queries is None:
+            vehicle_queries = [None] * len(queries)
+        
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        vector_rows = []
+        for i, (query, vehicle_query) in enumerate(zip(queries, vehicle_queries)):
+            if vehicle_query is not None and vehicle_query.has_strong_signals:
+                results[i] = self.search_vehicles_hybrid(query, vehicle_query, top_k)
+            elif query.strip():
+                vector_rows.append(i)
+        
+        if vector_rows:
+            query_matrix = self.encode_batch([queries[i] for i in vector_rows])
+            hits = self.vector_store.search_batch(query_matrix, top_k)
+            for i, (scores, metadata) in zip(vector_rows, hits):
+                results[i] = self._format_search_results(scores, metadata)
+        
+        logger.info("Completed batched search for {} queries", len(queries))
+        return results
+    
+    def _format_search_results(self, scores, metadata: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert vector store hits into result dicts."""
+        results = []
+        for score, meta in zip(scores, metadata):
+            # Handle different metadata structures defensively
+            if 'vehicle' in meta:
+                vehicle_data = meta['vehicle']
+            else:
+                # Fallback: use meta directly if 'vehicle' key missing
+                vehicle_data = {
+                    'year': meta.get('year', ''),
+                    'make': meta.get('make', ''),
+                    'model': meta.get('model', ''),
+                    'price': meta.get('price', 0),
+                    'features': meta.get('features', ''),
+                    'description': meta.get('description', ''),
+                    'mileage': meta.get('mileage', 0),
+                    'color': meta.get('color', ''),
+                    'condition': meta.get('condition', ''),
+                    'fuel_type': meta.get('fuel_type', ''),
+                    'transmission': meta.get('transmission', ''),
+                    'doors': meta.get('doors', 0),
+                    'seats': meta.get('seats', 0),
+                    'engine': meta.get('engine', ''),
+                    'drivetrain': meta.get('drivetrain', '')
+                }
+            
+            results.append({
+                'vehicle': vehicle_data,
+                'similarity_score': float(score),
+                'metadata': meta
+            })
+        
+        return results
+    
     def search_vehicles_with_filters(
         self, 
         query: str, 
         filters: Dict[str, Any], 
         top_k: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Search for vehicles with additional filters."""
-        # Get initial results
-        results = self.search_vehicles(query, top_k)
+        """Search for vehicles with additional filters.
         
-        # Apply filters
-        filtered_results = []
-        for result in results:
-            vehicle = result['vehicle']
-            match = True
-            
-            for key, value in filters.items():
-                if key in vehicle:
-                    if isinstance(value, (list, tuple)):
-                        if vehicle[key] not in value:
-                            match = False
-                            break
-                    else:
-                        if vehicle[key] != value:
-                            match = False
-                            break
-                else:
-                    match = False
-                    break
-            
-            if match:
-                filtered_results.append(result)
+        Filters are resolved to matching row ids first and passed to the
+        vector store, so top_k is taken from the filtered subset.
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Vector index not initialized. Call build_index() or load_index() first.")
+        
+        if not query.strip():
+            raise ValueError("Search query cannot be empty")
         
-        logger.info(f"Applied filters, found {len(filtered_results)} matching vehicles")
+        if top_k is None:
+            top_k = self.config.retrieval.top_k
+        
+        valid_ids = self._matching_ids(filters)
+        if not valid_ids:
+            logger.info("Applied filters, found 0 matching vehicles")
+            return []
+        
+        query_embedding = self.embedding_provider.embed_text(query)
+        scores, metadata = self.vector_store.search(
+            query_embedding, min(top_k, len(valid_ids)), ids=np.asarray(valid_ids, dtype=np.int64)
+        )
+        filtered_results = self._format_search_results(scores, metadata)
+        
+        logger.info("Applied filters, found {} matching vehicles", len(filtered_results))
         return filtered_results
     
+    def _matching_ids(self, filters: Dict[str, Any]) -> List[int]:
+        """Return row ids of indexed vehicles that satisfy every filter."""
+        valid_ids = []
+        for i, meta in enumerate(self.vector_store.metadata):
+            vehicle = meta.get('vehicle', meta)
+            for key, value in filters.items():
+                if key not in vehicle:
+                    break
+                if isinstance(value, (list, tuple)):
+                    if vehicle[key] not in value:
+                        break
+                elif vehicle[key] != value:
+                    break
+            else:
+                valid_ids.append(i)
+        return valid_ids
+    
     def search_vehicles_hybrid(
         self,
         query: str,
@@ -206,7 +317,7 @@ class VehicleRetriever:
             
             # If we have strong filters, apply them first
             if filters and vehicle_query.has_strong_signals:
-                logger.info(f"Applying metadata filters: {filters}")
+                logger.info("Applying metadata filters: {}", filters)
                 
                 # Get all vehicles and apply filters
                 all_vehicles = []
@@ -245,7 +356,7 @@ class VehicleRetriever:
                 
                 # If we have filtered results, apply vector similarity
                 if all_vehicles:
-                    logger.info(f"Found {len(all_vehicles)} vehicles matching metadata filters")
+                    logger.info("Found {} vehicles matching metadata filters", len(all_vehicles))
                     
                     # Create query embedding
                     query_embedding = self.embedding_provider.embed_text(query)
@@ -278,7 +389,7 @@ class VehicleRetriever:
                             }
                             results.append(result)
                         
-                        logger.info(f"Hybrid search found {len(results)} vehicles")
+                        logger.info("Hybrid search found {} vehicles", len(results))
                         return results
             
             # Fallback to regular vector search if no strong filters or no matches
@@ -292,8 +403,6 @@ class VehicleRetriever:
     
     def _calculate_similarity(self, embedding1, embedding2) -> float:
         """Calculate cosine similarity between two embeddings."""
-        import numpy as np
-        
         # Convert to numpy arrays if needed
         if not isinstance(embedding1, np.ndarray):
             embedding1 = np.array(embedding1)
@@ -340,15 +449,67 @@ class VehicleRetriever:
         try:
             logger.info(f"Updating index with new inventory: {inventory_file}")
             
-            # Rebuild index
-            self.build_index(inventory_file, index_path)
+            if not self.is_initialized:
+                self.build_index(inventory_file, index_path)
+                logger.info("Index updated successfully")
+                return
             
-            logger.info("Index updated successfully")
+            formatted_texts, metadata = self.inventory_processor.process_inventory(inventory_file)
+            new_hashes = [self._content_hash(text) for text in formatted_texts]
+            
+            # Counted rather than deduplicated, since build_index indexes repeated rows too
+            existing_hashes = Counter(
+                meta.get('content_hash') or self._content_hash(meta.get('formatted_text', ''))
+                for meta in self.vector_store.metadata
+            )
+            
+            # Vectors can only be appended, so removed or changed vehicles need a full rebuild
+            if existing_hashes - Counter(new_hashes):
+                logger.info("Vehicles were removed or changed, rebuilding index")
+                self.vector_store = get_vector_store(self.config)
+                self.build_index(inventory_file, index_path)
+                logger.info("Index updated successfully")
+                return
+            
+            new_texts = []
+            new_metadata = []
+            for text, meta, content_hash in zip(formatted_texts, metadata, new_hashes):
+                # Skip rows the index already holds, one indexed copy per row
+                if existing_hashes[content_hash] > 0:
+                    existing_hashes[content_hash] -= 1
+                    continue
+                meta['content_hash'] = content_hash
+                new_texts.append(text)
+                new_metadata.append(meta)
+            
+            if not new_texts:
+                logger.info("No new vehicles found, index is up to date")
+                return
+            
+            # int8 ranges are learned once, so retrain when most vectors would be new
+            if self.vector_store.needs_retraining(len(new_texts)):
+                logger.info("New vehicles outnumber the quantizer training set, rebuilding index")
+                self.vector_store = get_vector_store(self.config)
+                self.build_index(inventory_file, index_path)
+                logger.info("Index updated successfully")
+                return
+            
+            logger.info(f"Embedding {len(new_texts)} new vehicles")
+            embeddings = self._embed_texts_concurrently(new_texts)
+            self.vector_store.add_vectors(embeddings, new_metadata)
+            self.vector_store.save(index_path)
+            
+            logger.info(f"Index updated successfully with {len(new_texts)} new vehicles")
             
         except Exception as e:
             logger.error(f"Error updating index: {e}")
             raise
     
+    @staticmethod
+    def _content_hash(formatted_text: str) -> str:
+        """Stable hash of a vehicle's formatted text."""
+        return hashlib.blake2b(formatted_text.encode('utf-8'), digest_size=16).hexdigest()
+    
     def get_similar_vehicles(self, vehicle_id: int, top_k: int = 5) -> List[Dict[str, Any]]:
         """Find vehicles similar to a specific vehicle."""
         if not self.is_initialized:
@@ -372,7 +533,7 @@ class VehicleRetriever:
                 if result['metadata']['index'] != vehicle_id
             ][:top_k]
             
-            logger.info(f"Found {len(similar_vehicles)} vehicles similar to vehicle {vehicle_id}")
+            logger.info("Found {} vehicles similar to vehicle {}", len(similar_vehicles), vehicle_id)
             return similar_vehicles
             
         except Exception as e:
@@ -384,16 +545,37 @@ class VehicleRetriever:
         if not queries:
             return []
         
-        results = []
-        for query in queries:
+        if not self.is_initialized:
+            logger.warning("Vector index not initialized, batch search returning no results")
+            return [[] for _ in queries]
+        
+        if top_k is None:
+            top_k = self.config.retrieval.top_k
+        
+        # Repeated queries are embedded and searched only once
+        unique_queries = [query for query in dict.fromkeys(queries) if query.strip()]
+        unique_results = {}
+        
+        if unique_queries:
             try:
-                query_results = self.search_vehicles(query, top_k)
-                results.append(query_results)
+                query_matrix = self.encode_batch(unique_queries)
+                hits = self.vector_store.search_batch(query_matrix, top_k)
+                for query, (scores, metadata) in zip(unique_queries, hits):
+                    unique_results[query] = self._format_search_results(scores, metadata)
             except Exception as e:
-                logger.warning(f"Error searching for query '{query}': {e}")
-                results.append([])
+                logger.warning(f"Error in batched search, searching queries one at a time: {e}")
+                for query in unique_queries:
+                    try:
+                        query_embedding = self.embedding_provider.embed_text(query)
+                        scores, metadata = self.vector_store.search(query_embedding, top_k)
+                        unique_results[query] = self._format_search_results(scores, metadata)
+                    except Exception as e:
+                        logger.warning(f"Error searching for query '{query}': {e}")
+                        unique_results[query] = []
         
-        logger.info(f"Completed batch search for {len(queries)} queries")
+        results = [list(unique_results.get(query, [])) for query in queries]
+        
+        logger.info("Completed batch search for {} queries ({} unique)", len(queries), len(unique_queries))
         return results
     
     def get_search_suggestions(self, partial_query: str, limit: int = 5) -> List[str]:
@@ -444,14 +626,24 @@ class VehicleRetriever:
         if not query.strip():
             return {"valid": False, "error": "Query cannot be empty"}
         
+        query_lower = query.lower()
+        words = query_lower.split()
+        tokens = set()
+        for token in _WORD_PATTERN.findall(query_lower):
+            tokens.add(token)
+            # Let simple plurals ("suvs", "cars") match the singular terms
+            if token.endswith('s'):
+                tokens.add(token[:-1])
+        
         analysis = {
             "valid": True,
             "query": query,
             "length": len(query),
-            "word_count": len(query.split()),
-            "has_price_range": any(word in query.lower() for word in ['under', 'over', '$', 'price']),
-            "has_vehicle_type": any(word in query.lower() for word in ['sedan', 'suv', 'truck', 'car', 'vehicle']),
-            "has_brand": any(word in query.lower() for word in ['toyota', 'honda', 'ford', 'bmw', 'mercedes'])
+            "word_count": len(words),
+            # Words never contain '$', so check for it as a substring
+            "has_price_range": bool(tokens & _PRICE_TERMS) or '$' in query_lower,
+            "has_vehicle_type": bool(tokens & _VEHICLE_TYPE_TERMS),
+            "has_brand": bool(tokens & _BRAND_TERMS)
         }
         
         return analysis 
\ No newline at end of file
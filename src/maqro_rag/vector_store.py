@@ -2,15 +2,69 @@
 Vector store module for storing and retrieving embeddings.
 """
 
+import math
 import os
+import threading
 from abc import ABC, abstractmethod
 from typing import List, Tuple, Optional, Dict, Any
 import numpy as np
 import faiss
+import orjson
 from loguru import logger
 from .config import Config
 
 
+# Filtered HNSW searches over at most this many ids are scored exactly
+_EXACT_FILTER_MAX_IDS = 2048
+
+
+def _dump_record(record: Dict[str, Any]) -> bytes:
+    """Serialize one metadata record as a single JSON line."""
+    return orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+
+
+def _load_record(data: bytes) -> Dict[str, Any]:
+    """Deserialize one metadata record."""
+    return orjson.loads(data)
+
+
+def _prefault_file(path: str) -> None:
+    """Pull a file into the OS page cache."""
+    try:
+        with open(path, "rb") as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            else:
+                while f.read(1 << 20):
+                    pass
+    except OSError as e:
+        logger.debug(f"Could not prefetch {path}: {e}")
+
+
+def prefetch_index_files(path: str) -> threading.Thread:
+    """Start warming the page cache for a saved index in the background.
+    
+    Call before other startup work and join() the returned thread before
+    load(), so disk reads overlap with CPU-bound initialization.
+    """
+    def run():
+        for suffix in (".faiss", ".metadata", ".offsets"):
+            if os.path.exists(f"{path}{suffix}"):
+                _prefault_file(f"{path}{suffix}")
+    
+    thread = threading.Thread(target=run, name="index-prefetch", daemon=True)
+    thread.start()
+    return thread
+
+
+def _read_metadata(data_path: str, offsets_path: str) -> List[Dict[str, Any]]:
+    """Decode every NDJSON metadata record once, using the saved byte offsets."""
+    offsets = np.load(offsets_path).tolist()
+    with open(data_path, "rb") as f:
+        data = f.read()
+    return [_load_record(data[start:end]) for start, end in zip(offsets, offsets[1:])]
+
+
 class VectorStore(ABC):
     """Abstract base class for vector stores."""
     
@@ -20,10 +74,26 @@ class VectorStore(ABC):
         pass
     
     @abstractmethod
-    def search(self, query_vector: np.ndarray, top_k: int) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
-        """Search for similar vectors."""
+    def search(
+        self, query_vector: np.ndarray, top_k: int, ids: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """Search for similar vectors, optionally restricted to the given row ids."""
         pass
     
+    def search_batch(
+        self, query_vectors: np.ndarray, top_k: int
+    ) -> List[Tuple[np.ndarray, List[Dict[str, Any]]]]:
+        """Search for several query vectors, one result pair per row."""
+        return [self.search(query_vector, top_k) for query_vector in query_vectors]
+    
+    def needs_retraining(self, new_count: int) -> bool:
+        """Whether adding new_count vectors would outgrow the index's trained state."""
+        return False
+    
+    def matches_config(self) -> bool:
+        """Whether the loaded index was built with the configured layout."""
+        return True
+    
     @abstractmethod
     def save(self, path: str) -> None:
         """Save the vector store to disk."""
@@ -43,10 +113,45 @@ class FAISSVectorStore(VectorStore):
         self.dimension = config.vector_store.dimension
         self.index = None
         self.metadata = []
+        # Number of vectors the int8 quantizer was trained on (0 when untrained)
+        self.train_size = 0
+        # Per-thread reusable buffer for single-vector queries
+        self._local = threading.local()
         
-        # Initialize FAISS index
-        self.index = faiss.IndexFlatIP(self.dimension)  # Inner product for cosine similarity
-        logger.info(f"Initialized FAISS index with dimension {self.dimension}")
+        # Initialize FAISS index (inner product for cosine similarity)
+        precision = config.vector_store.precision.lower()
+        if precision not in ("fp16", "fp32", "int8"):
+            raise ValueError(f"Unsupported vector precision: {precision}")
+        index_type = config.vector_store.index_type.lower()
+        self.precision = precision
+        self.index_type = index_type
+        # fp16 halves and int8 quarters the memory read per vector on search
+        quantizer_type = {
+            "fp16": faiss.ScalarQuantizer.QT_fp16,
+            "int8": faiss.ScalarQuantizer.QT_8bit,
+        }.get(precision)
+        
+        if index_type == "hnsw":
+            # Graph index: sub-linear, approximate search for large inventories
+            m = config.vector_store.hnsw_m
+            if quantizer_type is not None:
+                self.index = faiss.IndexHNSWSQ(
+                    self.dimension, quantizer_type, m, faiss.METRIC_INNER_PRODUCT
+                )
+            else:
+                self.index = faiss.IndexHNSWFlat(self.dimension, m, faiss.METRIC_INNER_PRODUCT)
+            self.index.hnsw.efConstruction = config.vector_store.hnsw_ef_construction
+            self.index.hnsw.efSearch = config.vector_store.hnsw_ef_search
+        elif index_type == "flat":
+            if quantizer_type is not None:
+                self.index = faiss.IndexScalarQuantizer(
+                    self.dimension, quantizer_type, faiss.METRIC_INNER_PRODUCT
+                )
+            else:
+                self.index = faiss.IndexFlatIP(self.dimension)
+        else:
+            raise ValueError(f"Unsupported FAISS index type: {index_type}")
+        logger.info(f"Initialized FAISS {index_type} index with dimension {self.dimension} ({precision})")
     
     def add_vectors(self, vectors: np.ndarray, metadata: List[Dict[str, Any]]) -> None:
         """Add vectors to FAISS index."""
@@ -59,45 +164,152 @@ class FAISSVectorStore(VectorStore):
         # Normalize vectors for cosine similarity
         faiss.normalize_L2(vectors)
         
+        # int8 quantizers learn per-dimension ranges from the first vectors added
+        if not self.index.is_trained:
+            self.index.train(vectors)
+            self.train_size = len(vectors)
+        
         # Add to index
         self.index.add(vectors)
         self.metadata.extend(metadata)
         
         logger.info(f"Added {len(vectors)} vectors to FAISS index")
     
-    def search(self, query_vector: np.ndarray, top_k: int) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    def matches_config(self) -> bool:
+        """Whether the loaded index has the configured type, precision and dimension."""
+        if self.index is None:
+            return False
+        storage = faiss.downcast_index(self.index.storage) if hasattr(self.index, "hnsw") else self.index
+        qtype = storage.sq.qtype if hasattr(storage, "sq") else None
+        precision = {
+            faiss.ScalarQuantizer.QT_fp16: "fp16",
+            faiss.ScalarQuantizer.QT_8bit: "int8",
+        }.get(qtype, "fp32" if qtype is None else None)
+        index_type = "hnsw" if hasattr(self.index, "hnsw") else "flat"
+        return (index_type, precision, self.index.d) == (self.index_type, self.precision, self.dimension)
+    
+    def needs_retraining(self, new_count: int) -> bool:
+        """Whether appended vectors would clearly outnumber the int8 training set.
+        
+        Quantizer ranges are never updated after the first batch, so the
+        index should be rebuilt once most of its vectors were not trained on.
+        """
+        return self.train_size > 0 and len(self.metadata) + new_count > 2 * self.train_size
+    
+    def search(
+        self, query_vector: np.ndarray, top_k: int, ids: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
         """Search for similar vectors in FAISS index."""
         if self.index is None:
             raise ValueError("FAISS index not initialized")
         
-        # Ensure query vector is in the correct format for FAISS (2D array)
-        query_vector = np.array(query_vector, dtype=np.float32)
-        if query_vector.ndim == 1:
-            query_vector = query_vector.reshape(1, -1)
+        # Copy into a reusable (1, dimension) float32 buffer; normalize_L2
+        # works in place, so the caller's array is left untouched
+        query_vector = np.asarray(query_vector)
+        if query_vector.size == self.dimension:
+            buf = getattr(self._local, "query_buf", None)
+            if buf is None:
+                buf = self._local.query_buf = np.empty((1, self.dimension), dtype=np.float32)
+            np.copyto(buf[0], query_vector.reshape(-1))
+            query_vector = buf
+        else:
+            query_vector = np.array(query_vector, dtype=np.float32).reshape(-1, self.dimension)
         
         # Normalize query vector
         faiss.normalize_L2(query_vector)
         
-        # Search
-        scores, indices = self.index.search(query_vector, top_k)
+        # Search, restricting candidates inside FAISS when ids are given
+        if ids is None:
+            scores, indices = self.index.search(query_vector, top_k)
+        elif hasattr(self.index, "hnsw"):
+            scores, indices = self._search_hnsw_filtered(
+                query_vector, top_k, np.asarray(ids, dtype=np.int64)
+            )
+        else:
+            params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(np.asarray(ids, dtype=np.int64)))
+            scores, indices = self.index.search(query_vector, top_k, params=params)
+        
+        # FAISS pads with -1 when fewer than top_k vectors exist; drop those
+        # so scores and metadata stay aligned
+        valid = indices[0] >= 0
+        results_metadata = [self.metadata[i] for i in indices[0][valid].tolist()]
+        
+        return scores[0][valid], results_metadata
+    
+    def _search_hnsw_filtered(
+        self, query_vector: np.ndarray, top_k: int, ids: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Filtered HNSW search that does not drop matching vectors.
+        
+        The graph walk only visits about efSearch nodes, so a selective
+        filter leaves it with few or no allowed candidates.
+        """
+        if len(ids) <= _EXACT_FILTER_MAX_IDS:
+            # Few candidates: score every one of them exactly
+            candidate_scores = self.index.reconstruct_batch(ids) @ query_vector[0]
+            order = np.argsort(-candidate_scores, kind="stable")[:top_k]
+            return candidate_scores[order][None, :], ids[order][None, :]
+        
+        # Many candidates: widen the walk by how much of the index the filter rejects
+        ef_search = max(self.index.hnsw.efSearch, top_k) * math.ceil(self.index.ntotal / len(ids))
+        params = faiss.SearchParametersHNSW(
+            sel=faiss.IDSelectorBatch(ids), efSearch=min(ef_search, self.index.ntotal)
+        )
+        return self.index.search(query_vector, top_k, params=params)
+    
+    def search_batch(
+        self, query_vectors: np.ndarray, top_k: int
+    ) -> List[Tuple[np.ndarray, List[Dict[str, Any]]]]:
+        """Search for several query vectors with a single FAISS call."""
+        if self.index is None:
+            raise ValueError("FAISS index not initialized")
         
-        # Get metadata for results
-        results_metadata = [self.metadata[i] for i in indices[0] if i < len(self.metadata)]
+        query_vectors = np.array(query_vectors, dtype=np.float32).reshape(-1, self.dimension)
+        if not len(query_vectors):
+            return []
+        faiss.normalize_L2(query_vectors)
         
-        return scores[0], results_metadata
+        scores, indices = self.index.search(query_vectors, top_k)
+        
+        results = []
+        for row_scores, row_indices in zip(scores, indices):
+            valid = row_indices >= 0
+            row_metadata = [self.metadata[i] for i in row_indices[valid].tolist()]
+            results.append((row_scores[valid], row_metadata))
+        return results
     
     def save(self, path: str) -> None:
         """Save FAISS index and metadata to disk."""
         if self.index is None:
             raise ValueError("No index to save")
         
-        # Save FAISS index
-        faiss.write_index(self.index, f"{path}.faiss")
+        # Write every file to a temp path first so a crash mid-save never
+        # leaves a truncated index or vectors paired with another save's metadata
+        faiss.write_index(self.index, f"{path}.faiss.tmp")
+        
+        # Metadata as NDJSON plus byte offsets for each record
+        offsets = [0]
+        with open(f"{path}.metadata.tmp", 'wb') as f:
+            for meta in self.metadata:
+                offsets.append(offsets[-1] + f.write(_dump_record(meta)))
+        with open(f"{path}.offsets.tmp", 'wb') as f:
+            np.save(f, np.asarray(offsets, dtype=np.int64))
+        if self.train_size:
+            with open(f"{path}.train.tmp", 'wb') as f:
+                np.save(f, np.asarray([self.train_size], dtype=np.int64))
         
-        # Save metadata
-        import pickle
-        with open(f"{path}.metadata", 'wb') as f:
-            pickle.dump(self.metadata, f)
+        # Drop the old offsets first and write the new ones last, so while
+        # files are being swapped the save reads as unfinished
+        if os.path.exists(f"{path}.offsets"):
+            os.remove(f"{path}.offsets")
+        os.replace(f"{path}.faiss.tmp", f"{path}.faiss")
+        os.replace(f"{path}.metadata.tmp", f"{path}.metadata")
+        if self.train_size:
+            os.replace(f"{path}.train.tmp", f"{path}.train")
+        elif os.path.exists(f"{path}.train"):
+            # Left over from an int8 index previously saved at this path
+            os.remove(f"{path}.train")
+        os.replace(f"{path}.offsets.tmp", f"{path}.offsets")
         
         logger.info(f"Saved FAISS index and metadata to {path}")
     
@@ -105,11 +317,22 @@ class FAISSVectorStore(VectorStore):
         """Load FAISS index and metadata from disk."""
         # Load FAISS index
         self.index = faiss.read_index(f"{path}.faiss")
+        if hasattr(self.index, "hnsw"):
+            # Search breadth is a query-time setting, so apply the current config
+            self.index.hnsw.efSearch = self.config.vector_store.hnsw_ef_search
+        self.train_size = (
+            int(np.load(f"{path}.train")[0]) if os.path.exists(f"{path}.train") else 0
+        )
         
         # Load metadata
-        import pickle
-        with open(f"{path}.metadata", 'rb') as f:
-            self.metadata = pickle.load(f)
+        if os.path.exists(f"{path}.offsets"):
+            # Decoded up front so filtering and search never re-parse records
+            self.metadata = _read_metadata(f"{path}.metadata", f"{path}.offsets")
+        else:
+            # Legacy pickled metadata
+            import pickle
+            with open(f"{path}.metadata", 'rb') as f:
+                self.metadata = pickle.load(f)
         
         logger.info(f"Loaded FAISS index and metadata from {path}")
 
@@ -126,7 +349,9 @@ class PineconeVectorStore(VectorStore):
         """Add vectors to Pinecone index."""
         raise NotImplementedError("Pinecone integration not yet implemented")
     
-    def search(self, query_vector: np.ndarray, top_k: int) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    def search(
+        self, query_vector: np.ndarray, top_k: int, ids: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
         """Search for similar vectors in Pinecone index."""
         raise NotImplementedError("Pinecone integration not yet implemented")
     
@@ -151,7 +376,9 @@ class WeaviateVectorStore(VectorStore):
         """Add vectors to Weaviate index."""
         raise NotImplementedError("Weaviate integration not yet implemented")
     
-    def search(self, query_vector: np.ndarray, top_k: int) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    def search(
+        self, query_vector: np.ndarray, top_k: int, ids: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
         """Search for similar vectors in Weaviate index."""
         raise NotImplementedError("Weaviate integration not yet implemented")
     
@@ -3,32 +3,54 @@
 Simple test to verify OpenAI API key is working.
 """
 
+import atexit
 import os
+from functools import lru_cache
+
+import httpx
 import openai
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Set API key
-api_key = os.getenv("OPENAI_API_KEY")
-print(f"API Key loaded: {api_key[:20]}..." if api_key else "No API key found")
-
-# Test OpenAI API
-try:
-    client = openai.OpenAI(api_key=api_key)
-    
-    # Simple test
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "user", "content": "Say 'Hello, API key is working!'"}
-        ],
-        max_tokens=50
+
+@lru_cache(maxsize=1)
+def _get_client() -> openai.OpenAI:
+    """Shared OpenAI client; repeated probes reuse its pooled connection"""
+    client = openai.OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=4),
+            timeout=10.0
+        )
     )
-    
-    print("✅ API Key is working!")
-    print(f"Response: {response.choices[0].message.content}")
-    
-except Exception as e:
-    print(f"❌ API Key error: {e}") 
\ No newline at end of file
+    atexit.register(client.close)
+    return client
+
+
+def main():
+    # Set API key
+    api_key = os.getenv("OPENAI_API_KEY")
+    print(f"API Key loaded: {api_key[:20]}..." if api_key else "No API key found")
+
+    # Test OpenAI API
+    try:
+        # Simple test
+        response = _get_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "user", "content": "Say 'Hello, API key is working!'"}
+            ],
+            max_tokens=50
+        )
+
+        print("✅ API Key is working!")
+        print(f"Response: {response.choices[0].message.content}")
+
+    except Exception as e:
+        print(f"❌ API Key error: {e}")
+
+
+if __name__ == "__main__":
+    main()
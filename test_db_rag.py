@@ -5,12 +5,49 @@ Test script for Database RAG system
 import asyncio
 import sys
 import os
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+# Concurrent searches; stays within the engine's default pool of 5 connections
+QUERY_CONCURRENCY = 4
+
+# Test search queries
+TEST_QUERIES = (
+    "Do you have any Toyota",
+    "Looking for a Honda Civic",
+    "Show me SUVs under 30k",
+    "Any luxury sedans?",
+)
+
+
+async def _run_query(semaphore, async_session_maker, db_retriever, entity_parser, query, query_embedding, dealership_id):
+    """Parse and search a single query on its own session"""
+    vehicle_query = entity_parser.parse_message(query)
+    
+    async with semaphore, async_session_maker() as session:
+        if vehicle_query.has_strong_signals:
+            results = await db_retriever.search_vehicles_hybrid(
+                session=session,
+                query=query,
+                vehicle_query=vehicle_query,
+                dealership_id=dealership_id,
+                top_k=3,
+                query_embedding=query_embedding
+            )
+            return query, vehicle_query, "hybrid", results
+        
+        results = await db_retriever.search_vehicles(
+            session=session,
+            query=query,
+            dealership_id=dealership_id,
+            top_k=3,
+            query_embedding=query_embedding
+        )
+        return query, vehicle_query, "vector", results
+
+
 async def test_db_rag():
     """Test the database RAG system"""
     try:
@@ -20,11 +57,9 @@ async def test_db_rag():
         from maqro_rag.config import Config
         from maqro_rag.db_retriever import DatabaseRAGRetriever
         from maqro_rag.entity_parser import EntityParser
-        from maqro_backend.core.config import settings
         
-        # Create database connection
-        engine = create_async_engine(settings.database_url)
-        async_session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        # Reuse the backend's pooled engine rather than opening a separate one
+        from maqro_backend.db.session import engine, SessionLocal as async_session_maker
         
         # Initialize components
         config = Config.from_yaml("config.yaml")
@@ -52,50 +87,38 @@ async def test_db_rag():
                     force_rebuild=False
                 )
                 print(f"✅ Built {built_count} embeddings")
+                
+                if built_count:
+                    # Refresh planner statistics after the bulk load so the
+                    # searches below are planned against the new rows
+                    await session.execute(text("ANALYZE vehicle_embeddings"))
+                    await session.commit()
             
-            # Test search queries
-            test_queries = [
-                "Do you have any Toyota",
-                "Looking for a Honda Civic",
-                "Show me SUVs under 30k",
-                "Any luxury sedans?"
-            ]
+        # Embed every query in one batched request up front
+        query_embeddings = await db_retriever.embed_queries(list(TEST_QUERIES))
+        
+        # Queries are independent, so run them concurrently; each gets its own
+        # session because an AsyncSession cannot be shared across tasks.
+        semaphore = asyncio.Semaphore(QUERY_CONCURRENCY)
+        query_results = await asyncio.gather(*(
+            _run_query(semaphore, async_session_maker, db_retriever, entity_parser, query, query_embedding, dealership_id)
+            for query, query_embedding in zip(TEST_QUERIES, query_embeddings)
+        ))
+        
+        for query, vehicle_query, search_type, results in query_results:
+            print(f"\n🔍 Testing query: '{query}'")
+            print(f"   📋 Parsed: make={vehicle_query.make}, strong_signals={vehicle_query.has_strong_signals}")
+            print(f"   🎯 Used {search_type} search")
             
-            for query in test_queries:
-                print(f"\n🔍 Testing query: '{query}'")
-                
-                # Parse entities
-                vehicle_query = entity_parser.parse_message(query)
-                print(f"   📋 Parsed: make={vehicle_query.make}, strong_signals={vehicle_query.has_strong_signals}")
-                
-                # Search vehicles
-                if vehicle_query.has_strong_signals:
-                    results = await db_retriever.search_vehicles_hybrid(
-                        session=session,
-                        query=query,
-                        vehicle_query=vehicle_query,
-                        dealership_id=dealership_id,
-                        top_k=3
-                    )
-                    print(f"   🎯 Used hybrid search")
-                else:
-                    results = await db_retriever.search_vehicles(
-                        session=session,
-                        query=query,
-                        dealership_id=dealership_id,
-                        top_k=3
-                    )
-                    print(f"   🎯 Used vector search")
-                
-                # Display results
-                if results:
-                    print(f"   ✅ Found {len(results)} vehicles:")
-                    for i, result in enumerate(results, 1):
-                        vehicle = result['vehicle']
-                        score = result['similarity_score']
-                        print(f"      {i}. {vehicle.get('year')} {vehicle.get('make')} {vehicle.get('model')} - ${vehicle.get('price'):,} (Score: {score:.3f})")
-                else:
-                    print("   ❌ No vehicles found")
+            # Display results
+            if results:
+                print(f"   ✅ Found {len(results)} vehicles:")
+                for i, result in enumerate(results, 1):
+                    vehicle = result['vehicle']
+                    score = result['similarity_score']
+                    print(f"      {i}. {vehicle.get('year')} {vehicle.get('make')} {vehicle.get('model')} - ${vehicle.get('price'):,} (Score: {score:.3f})")
+            else:
+                print("   ❌ No vehicles found")
         
         await engine.dispose()
         print("\n🎉 Database RAG test completed successfully!")
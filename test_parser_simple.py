@@ -1,40 +1,67 @@
 #!/usr/bin/env python3
 """
 Simple test for the SMS parser test drive scheduling functionality
+
+Run with pytest or directly as a script.
 """
 
 import sys
 import os
+import asyncio
+
+import pytest
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-def test_sms_parser():
+# Test messages
+TEST_MESSAGES = [
+    "Customer Sarah wants to test drive the 2020 Toyota Camry tomorrow at 2pm. Her number is 555-1234. She mentioned she has a 2-hour window.",
+    "John wants to test drive a Honda Civic next week at 10am. Phone: 555-9876",
+    "Test drive request: Mary Johnson - 555-1111 - interested in 2019 Ford Escape - tomorrow 3pm",
+    "Customer wants to schedule test drive for BMW X3. Available Friday at 1pm. Contact: 555-2222"
+]
+
+# Parsing goes through the OpenAI API; skip instead of failing when it is not configured
+pytestmark = pytest.mark.skipif(
+    not os.getenv("OPENAI_API_KEY"),
+    reason="OPENAI_API_KEY not set"
+)
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """Share the service's SMS parser (and its OpenAI clients) across all cases"""
+    from maqro_backend.services.sms_parser import sms_parser
+    return sms_parser
+
+
+@pytest.mark.parametrize("message", TEST_MESSAGES)
+def test_sms_parser(message, parser):
     """Test the SMS parser for test drive scheduling"""
+    parsed = parser.parse_message(message)
     
+    assert parsed.get('type') == 'test_drive_scheduling'
+    assert parsed.get('data', {}).get('vehicle_interest')
+
+
+def main():
+    """Run the cases as a script and print the parsed fields"""
     try:
-        from maqro_backend.services.sms_parser import SMSParser
+        from maqro_backend.services.sms_parser import sms_parser as parser
         
         print("✅ Successfully imported SMS parser")
         
         # Test SMS parsing
         print("\n🧪 Testing SMS parsing for test drive scheduling...")
         
-        parser = SMSParser()
-        
-        # Test messages
-        test_messages = [
-            "Customer Sarah wants to test drive the 2020 Toyota Camry tomorrow at 2pm. Her number is 555-1234. She mentioned she has a 2-hour window.",
-            "John wants to test drive a Honda Civic next week at 10am. Phone: 555-9876",
-            "Test drive request: Mary Johnson - 555-1111 - interested in 2019 Ford Escape - tomorrow 3pm",
-            "Customer wants to schedule test drive for BMW X3. Available Friday at 1pm. Contact: 555-2222"
-        ]
+        # Parse every message concurrently, then report in order
+        results = asyncio.run(parser.parse_messages(TEST_MESSAGES))
         
-        for i, message in enumerate(test_messages, 1):
+        for i, (message, parsed) in enumerate(zip(TEST_MESSAGES, results), 1):
             print(f"\n--- Test Message {i} ---")
             print(f"Message: {message}")
             
-            parsed = parser.parse_message(message)
             print(f"Parsed type: {parsed.get('type', 'unknown')}")
             
             if parsed.get('type') == 'test_drive_scheduling':
@@ -59,4 +86,4 @@ def test_sms_parser():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    test_sms_parser()
+    main()
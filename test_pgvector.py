@@ -5,8 +5,6 @@ Test if pgvector extension is properly installed in Supabase
 import asyncio
 import sys
 import os
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy import text
 
 # Add src to path
@@ -15,11 +13,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 async def test_pgvector():
     """Test pgvector extension"""
     try:
-        from maqro_backend.core.config import settings
-        
-        # Create database connection
-        engine = create_async_engine(settings.database_url)
-        async_session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        # Reuse the backend's pooled engine rather than opening a separate one
+        from maqro_backend.db.session import engine, SessionLocal as async_session_maker
         
         async with async_session_maker() as session:
             print("🔍 Testing pgvector extension...")
@@ -39,48 +34,38 @@ async def test_pgvector():
                 print("   Please run: CREATE EXTENSION vector; in Supabase")
                 return False
             
-            # Test 2: Check if our table exists
-            result = await session.execute(
-                text("SELECT COUNT(*) FROM vehicle_embeddings;")
-            )
-            count = result.scalar()
-            print(f"✅ vehicle_embeddings table exists with {count} rows")
-            
-            # Test 3: Test simple vector operation
+            # Tests 2-5: table, vector cast, similarity and our query structure,
+            # checked together in a single round trip
             print("🧪 Testing vector operations...")
             
             test_embedding = "[0.1, 0.2, 0.3]"
-            result = await session.execute(
-                text(f"SELECT '{test_embedding}'::vector;")
-            )
-            vector_result = result.scalar()
-            print(f"✅ Vector casting works: {vector_result}")
-            
-            # Test 4: Test vector similarity
             test_embedding2 = "[0.2, 0.3, 0.4]"
-            result = await session.execute(
-                text(f"SELECT '{test_embedding}'::vector <=> '{test_embedding2}'::vector as distance;")
-            )
-            distance = result.scalar()
-            print(f"✅ Vector similarity works: distance = {distance}")
-            
-            # Test 5: Test our actual query structure (simplified)
+            # Use a 1536-dimension test vector (matching OpenAI embeddings)
+            test_vector_1536 = "[" + ",".join(["0.1"] * 1536) + "]"
             try:
-                # Use a 1536-dimension test vector (matching OpenAI embeddings)
-                test_vector_1536 = "[" + ",".join(["0.1"] * 1536) + "]"
+                # Bound rather than inlined, so the statement text stays small and cacheable
                 result = await session.execute(
-                    text(f"""
-                    SELECT COUNT(*) 
-                    FROM vehicle_embeddings ve
-                    WHERE ve.embedding <=> '{test_vector_1536}'::vector IS NOT NULL
-                    """)
+                    text("""
+                    SELECT
+                        (SELECT COUNT(*) FROM vehicle_embeddings) AS row_count,
+                        CAST(:a AS vector) AS vector_result,
+                        CAST(:a AS vector) <=> CAST(:b AS vector) AS distance,
+                        (SELECT COUNT(*)
+                         FROM vehicle_embeddings ve
+                         WHERE ve.embedding <=> CAST(:query_vector AS vector) IS NOT NULL) AS probe_count
+                    """),
+                    {"a": test_embedding, "b": test_embedding2, "query_vector": test_vector_1536}
                 )
-                count = result.scalar()
-                print(f"✅ Our query structure works: {count} embeddings tested")
+                checks = result.one()
                 
             except Exception as e:
                 print(f"❌ Query structure error: {e}")
                 return False
+            
+            print(f"✅ vehicle_embeddings table exists with {checks.row_count} rows")
+            print(f"✅ Vector casting works: {checks.vector_result}")
+            print(f"✅ Vector similarity works: distance = {checks.distance}")
+            print(f"✅ Our query structure works: {checks.probe_count} embeddings tested")
         
         await engine.dispose()
         print("\n🎉 pgvector is working correctly!")
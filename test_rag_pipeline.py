@@ -7,29 +7,50 @@ It uses the same components as the conversation endpoint but in a simplified way
 
 Usage:
     python test_rag_pipeline.py "Do you have a white Tiguan under 32k?"
+    python test_rag_pipeline.py "Any hybrids under 25k?" "SUV with 3rd row this weekend"
+    python test_rag_pipeline.py --cache "Any hybrids under 25k?"
+    python test_rag_pipeline.py --pack "Any hybrids under 25k?" "SUV with 3rd row this weekend"
+
+With --cache, LLM responses are stored on disk keyed by the full prompt, so
+re-running the same queries against the same index skips the OpenAI calls.
+With --pack, several messages are answered by one JSON-mode chat completion.
 """
 
 import os
 import sys
 import asyncio
+import hashlib
+import json
 import logging
+import shelve
+import time
 from typing import List, Dict, Any
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from maqro_rag.entity_parser import EntityParser
-from maqro_rag.retrieval import VehicleRetriever
-from maqro_rag.prompt_builder import PromptBuilder, AgentConfig
-from maqro_rag.config import Config
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# On-disk LLM response cache; bump the version when the model or system prompt changes
+CACHE_PATH = ".rag_pipeline_cache"
+CACHE_VERSION = "v1"
+LLM_MODEL = "gpt-4o-mini"
+
+# Concurrent LLM requests; the HTTP pool keeps exactly this many warm connections
+LLM_CONCURRENCY = 5
+LLM_MAX_RETRIES = 3
+
 class RAGPipelineTester:
-    def __init__(self):
+    def __init__(self, use_cache: bool = False):
         """Initialize the RAG pipeline components"""
+        # Imported here so collecting or importing this script does not pull in FAISS/numpy
+        from maqro_rag.entity_parser import EntityParser
+        from maqro_rag.retrieval import VehicleRetriever
+        from maqro_rag.prompt_builder import PromptBuilder, AgentConfig
+        from maqro_rag.config import Config
+        
         self.config = Config.from_yaml("config.yaml")
         self.vehicle_retriever = VehicleRetriever(self.config)
         self.entity_parser = EntityParser()
@@ -53,11 +74,27 @@ class RAGPipelineTester:
         )
         
         self.prompt_builder = PromptBuilder(self.agent_config)
+        
+        # Shared async OpenAI client; created on first LLM call
+        self._llm_client = None
+        self._llm_semaphore = None
+        
+        self._cache = shelve.open(CACHE_PATH) if use_cache else None
+    
+    async def close(self):
+        """Flush and close the response cache and the LLM client's connections"""
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+        if self._llm_client is not None:
+            await self._llm_client.close()
+            self._llm_client = None
     
-    def test_entity_parsing(self, message: str) -> Dict[str, Any]:
-        """Test entity parsing from user message"""
+    def test_entity_parsing(self, message: str, vehicle_query: Any = None) -> Dict[str, Any]:
+        """Test entity parsing from user message (reuses vehicle_query if already parsed)"""
         logger.info("🔍 Testing entity parsing...")
-        vehicle_query = self.entity_parser.parse_message(message)
+        if vehicle_query is None:
+            vehicle_query = self.entity_parser.parse_message(message)
         
         result = {
             "make": vehicle_query.make,
@@ -111,7 +148,7 @@ class RAGPipelineTester:
         logger.info("📝 Testing prompt building...")
         
         try:
-            if retrieved_cars and len(retrieved_cars) > 0:
+            if retrieved_cars:
                 prompt = self.prompt_builder.build_grounded_prompt(
                     user_message=message,
                     retrieved_cars=retrieved_cars,
@@ -135,6 +172,30 @@ class RAGPipelineTester:
             logger.error(f"❌ Error in prompt building: {e}")
             return ""
     
+    def _get_llm_client(self):
+        """Return the shared async OpenAI client, creating it on first use
+        
+        Concurrency is capped by a semaphore sized to the connection pool so
+        every in-flight request has a pooled connection, and transient errors
+        are retried with backoff by the client instead of failing the run.
+        """
+        if self._llm_client is None:
+            import httpx
+            import openai
+            self._llm_client = openai.AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                max_retries=LLM_MAX_RETRIES,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=LLM_CONCURRENCY,
+                        max_keepalive_connections=LLM_CONCURRENCY
+                    ),
+                    timeout=60.0
+                )
+            )
+            self._llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+        return self._llm_client
+    
     async def test_llm_generation(self, prompt: str) -> str:
         """Test LLM generation (requires OpenAI API key)"""
         logger.info("🤖 Testing LLM generation...")
@@ -145,23 +206,47 @@ class RAGPipelineTester:
             logger.error("export OPENAI_API_KEY='sk-your-api-key-here'")
             return "❌ No OpenAI API key available"
         
+        # The prompt already contains the retrieved vehicles, so an index
+        # change produces a new key
+        cache_key = hashlib.sha1(f"{CACHE_VERSION}:{LLM_MODEL}:{prompt}".encode()).hexdigest()
+        if self._cache is not None and cache_key in self._cache:
+            generated_response = self._cache[cache_key]
+            logger.info(f"✅ Cached response: {generated_response}")
+            return generated_response
+        
         try:
-            import openai
-            client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            client = self._get_llm_client()
             
-            response = await asyncio.to_thread(
-                client.chat.completions.create,
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful car salesperson assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=150,
-                temperature=0.7
-            )
+            async with self._llm_semaphore:
+                # Stream so the first tokens are seen as soon as they arrive
+                started = time.perf_counter()
+                first_token_at = None
+                chunks = []
+                stream = await client.chat.completions.create(
+                    model=LLM_MODEL,
+                    messages=[
+                        {"role": "system", "content": "You are a helpful car salesperson assistant."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=150,
+                    temperature=0.7,
+                    stream=True
+                )
+                async for event in stream:
+                    if not event.choices:
+                        continue
+                    delta = event.choices[0].delta.content
+                    if delta:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter() - started
+                        chunks.append(delta)
             
-            generated_response = response.choices[0].message.content
+            generated_response = "".join(chunks)
+            if first_token_at is not None:
+                logger.info(f"⏱️ First token after {first_token_at:.2f}s")
             logger.info(f"✅ Generated response: {generated_response}")
+            if self._cache is not None:
+                self._cache[cache_key] = generated_response
             return generated_response
             
         except ImportError:
@@ -171,6 +256,106 @@ class RAGPipelineTester:
             logger.error(f"❌ Error in LLM generation: {e}")
             return f"❌ LLM generation failed: {str(e)}"
     
+    async def test_llm_generation_packed(self, prompts: List[str]) -> List[str]:
+        """Answer several prompts with a single JSON-mode chat completion
+        
+        The prefix shared by all prompts (system prompt and examples) is sent
+        once as the system message. Falls back to one call per prompt if the
+        reply cannot be matched back to the prompts.
+        """
+        if len(prompts) < 2 or not os.getenv("OPENAI_API_KEY"):
+            return list(await asyncio.gather(*(self.test_llm_generation(p) for p in prompts)))
+        
+        # Cut the shared prefix at a section boundary so no prompt starts mid-line
+        shared = os.path.commonprefix(prompts)
+        shared = shared[:shared.rfind("\n\n") + 1] if "\n\n" in shared else ""
+        tasks = [prompt[len(shared):].strip() for prompt in prompts]
+        
+        logger.info(f"🤖 Testing packed LLM generation for {len(prompts)} prompts...")
+        try:
+            client = self._get_llm_client()
+            
+            system_prompt = (shared or "You are a helpful car salesperson assistant.") + (
+                '\n\nYou will receive a JSON array of tasks. Answer each one independently and '
+                'return a JSON object {"responses": [...]} with one reply string per task, in order.'
+            )
+            async with self._llm_semaphore:
+                response = await client.chat.completions.create(
+                    model=LLM_MODEL,
+                    response_format={"type": "json_object"},
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": json.dumps(tasks)}
+                    ],
+                    max_tokens=150 * len(prompts),
+                    temperature=0.7
+                )
+            
+            responses = json.loads(response.choices[0].message.content)["responses"]
+            if len(responses) != len(prompts):
+                raise ValueError(f"expected {len(prompts)} responses, got {len(responses)}")
+            logger.info(f"✅ Generated {len(responses)} responses in one request")
+            return [str(r) for r in responses]
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Packed generation failed, falling back to one call per prompt: {e}")
+            return list(await asyncio.gather(*(self.test_llm_generation(p) for p in prompts)))
+    
+    async def test_full_pipelines(self, messages: List[str], pack: bool = False) -> List[Dict[str, Any]]:
+        """Test the pipeline for several messages, running LLM calls concurrently"""
+        # Parsing, retrieval and prompt building are local and cheap; do them first
+        vehicle_queries = self.entity_parser.parse_messages(messages)
+        entities = [
+            self.test_entity_parsing(message, vehicle_query)
+            for message, vehicle_query in zip(messages, vehicle_queries)
+        ]
+        
+        # One embedding call and one index search for all messages
+        try:
+            retrieved = self.vehicle_retriever.search_vehicles_batch(messages, vehicle_queries, top_k=5)
+            logger.info(f"✅ Retrieved vehicles for {len(messages)} messages in one batch")
+        except Exception as e:
+            logger.error(f"❌ Error in batched vehicle retrieval: {e}")
+            retrieved = [[] for _ in messages]
+        
+        # Grounded prompts share one system prompt and example block
+        grounded = [i for i, retrieved_cars in enumerate(retrieved) if retrieved_cars]
+        prompts = {}
+        try:
+            grounded_prompts = self.prompt_builder.build_grounded_prompts(
+                [(messages[i], retrieved[i]) for i in grounded],
+                agent_config=self.agent_config
+            )
+            prompts.update(zip(grounded, grounded_prompts))
+        except Exception as e:
+            logger.error(f"❌ Error in batched prompt building: {e}")
+        
+        prepared = []
+        for i, (message, message_entities, retrieved_cars) in enumerate(zip(messages, entities, retrieved)):
+            prompt = prompts.get(i)
+            if prompt is None:
+                prompt = self.test_prompt_building(message, retrieved_cars)
+            prepared.append((message, message_entities, retrieved_cars, prompt))
+        
+        if pack:
+            responses = await self.test_llm_generation_packed([prompt for _, _, _, prompt in prepared])
+        else:
+            # Fire all chat completions at once instead of one round-trip at a time
+            responses = await asyncio.gather(
+                *(self.test_llm_generation(prompt) for _, _, _, prompt in prepared)
+            )
+        
+        return [
+            {
+                "user_message": message,
+                "entities": entities,
+                "retrieved_vehicles": len(retrieved_cars),
+                "vehicle_details": [car['vehicle'] for car in retrieved_cars[:3]],
+                "ai_response": response
+            }
+            for (message, entities, retrieved_cars, _), response in zip(prepared, responses)
+        ]
+    
     async def test_full_pipeline(self, message: str) -> Dict[str, Any]:
         """Test the complete RAG pipeline"""
         logger.info(f"🚀 Testing full RAG pipeline for: '{message}'")
@@ -178,7 +363,7 @@ class RAGPipelineTester:
         
         # 1. Entity parsing
         vehicle_query = self.entity_parser.parse_message(message)
-        entities = self.test_entity_parsing(message)
+        entities = self.test_entity_parsing(message, vehicle_query)
         
         # 2. Retrieval
         retrieved_cars = self.test_retrieval(message, vehicle_query)
@@ -208,7 +393,7 @@ class RAGPipelineTester:
 async def main():
     """Main function to run the RAG pipeline test"""
     if len(sys.argv) < 2:
-        print("Usage: python test_rag_pipeline.py \"Your message here\"")
+        print("Usage: python test_rag_pipeline.py \"Your message here\" [\"Another message\" ...]")
         print("\nExample queries:")
         print("  python test_rag_pipeline.py \"Do you have a white Tiguan under 32k?\"")
         print("  python test_rag_pipeline.py \"Looking for a 2021-2023 Civic EX around 20k\"")
@@ -216,21 +401,40 @@ async def main():
         print("  python test_rag_pipeline.py \"Any hybrids under 25k?\"")
         return
     
-    message = sys.argv[1]
+    flags = {"--cache", "--pack"}
+    use_cache = "--cache" in sys.argv[1:]
+    pack = "--pack" in sys.argv[1:]
+    messages = [arg for arg in sys.argv[1:] if arg not in flags]
+    if not messages:
+        print("Usage: python test_rag_pipeline.py [--cache] [--pack] \"Your message here\"")
+        return
     
     # Initialize tester
-    tester = RAGPipelineTester()
+    tester = RAGPipelineTester(use_cache=use_cache)
     
     # Run full pipeline test
-    result = await tester.test_full_pipeline(message)
+    try:
+        if len(messages) == 1:
+            results = [await tester.test_full_pipeline(messages[0])]
+        else:
+            results = await tester.test_full_pipelines(messages, pack=pack)
+    finally:
+        await tester.close()
     
-    # Print final summary
-    print("\n" + "=" * 60)
-    print("📊 FINAL SUMMARY:")
-    print(f"Query: {result['user_message']}")
-    print(f"Entities: {result['entities']}")
-    print(f"Vehicles Found: {result['retrieved_vehicles']}")
-    print(f"AI Response: {result['ai_response']}")
+    # Print final summary in a single write
+    lines = []
+    for result in results:
+        lines.extend((
+            "",
+            "=" * 60,
+            "📊 FINAL SUMMARY:",
+            f"Query: {result['user_message']}",
+            f"Entities: {result['entities']}",
+            f"Vehicles Found: {result['retrieved_vehicles']}",
+            f"AI Response: {result['ai_response']}",
+        ))
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
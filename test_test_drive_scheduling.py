@@ -15,15 +15,13 @@ async def test_test_drive_scheduling():
     
     try:
         from maqro_backend.services.salesperson_sms_service import SalespersonSMSService
-        from maqro_backend.services.sms_parser import SMSParser
+        from maqro_backend.services.sms_parser import sms_parser as parser
         
         print("✅ Successfully imported required modules")
         
         # Test SMS parsing
         print("\n🧪 Testing SMS parsing for test drive scheduling...")
         
-        parser = SMSParser()
-        
         # Test message
         test_message = "Customer Sarah wants to test drive the 2020 Toyota Camry tomorrow at 2pm. Her number is 555-1234. She mentioned she has a 2-hour window."
         